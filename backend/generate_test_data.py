@@ -1,13 +1,24 @@
 """Generate test datasets for different investor profiles"""
 
-import random
+from collections import Counter
+from types import MappingProxyType
 import numpy as np
 from datetime import datetime, timedelta
-from src.database import save_trade, init_database, get_database_stats
+from src.database import save_trades_bulk, init_database, get_database_stats, close_db_connections
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Seeded generator for reproducibility; all sampling draws from it in bulk
+_rng = np.random.default_rng(42)
+
+
+# Base prices for common stocks (approximate real values)
+_BASE_PRICES = MappingProxyType({
+    'AAPL': 275, 'MSFT': 485, 'GOOGL': 195, 'AMZN': 225, 'META': 650,
+    'NVDA': 875, 'TSLA': 385, 'AMD': 135, 'JPM': 240, 'BAC': 45,
+    'JNJ': 160, 'PFE': 26, 'XOM': 110, 'COIN': 235, 'PLTR': 70,
+    'SNOW': 165, 'RIVN': 12, 'ARKK': 48, 'SOFI': 15, 'HOOD': 32,
+    'NIO': 4, 'SPY': 600, 'VTI': 285, 'QQQ': 525, 'VOO': 555,
+    'VIG': 205, 'BND': 70, 'PG': 170, 'KO': 62, 'T': 22
+})
 
 
 # Define investor profiles
@@ -89,126 +100,121 @@ PROFILES = {
 }
 
 
-def generate_position_size(profile):
-    """Generate a realistic position size based on profile"""
-    mean = profile['position_size']['mean']
-    std = profile['position_size']['std']
-    min_size = profile['position_size']['min']
-    max_size = profile['position_size']['max']
-    
-    # Generate with some skew (more smaller positions)
-    size = np.random.lognormal(np.log(mean), 0.5)
-    size = np.clip(size, min_size, max_size)
-    
-    return round(size, 2)
-
-
-def select_stock(profile):
-    """Select a stock based on weighted probabilities"""
+def _add_stock_columns(profile):
+    """Attach column arrays of the profile's stocks for vectorized sampling"""
     stocks = profile['stocks']
-    symbols = list(stocks.keys())
-    weights = [stocks[s]['weight'] for s in symbols]
-    
-    symbol = random.choices(symbols, weights=weights, k=1)[0]
-    return symbol, stocks[symbol]
+    profile['_symbols'] = np.array(list(stocks.keys()))
+    profile['_weights'] = np.array([s['weight'] for s in stocks.values()], dtype=np.float64)
+    profile['_weights'] /= profile['_weights'].sum()
+    profile['_betas'] = np.array([s['beta'] for s in stocks.values()], dtype=np.float64)
+    profile['_sectors'] = np.array([s['sector'] for s in stocks.values()])
+    profile['_base_prices'] = np.array(
+        [_BASE_PRICES.get(symbol, 100.0) for symbol in stocks], dtype=np.float64
+    )
 
 
-def generate_entry_price(symbol, base_prices):
-    """Generate a realistic entry price for a symbol"""
-    base_price = base_prices.get(symbol, 100.0)
-    # Add some randomness (±20% variation)
-    variation = random.uniform(-0.20, 0.20)
-    price = base_price * (1 + variation)
-    return round(price, 2)
+for _profile in PROFILES.values():
+    _add_stock_columns(_profile)
 
 
-def generate_entry_date(start_date, end_date):
-    """Generate a random date between start and end"""
-    time_between = end_date - start_date
-    days_between = time_between.days
-    random_days = random.randint(0, days_between)
-    return start_date + timedelta(days=random_days)
+def generate_position_size(profile, n=1, rng=None):
+    """Generate n realistic position sizes based on profile"""
+    if rng is None:
+        rng = _rng
+    mean = profile['position_size']['mean']
+    min_size = profile['position_size']['min']
+    max_size = profile['position_size']['max']
+    
+    # Generate with some skew (more smaller positions)
+    sizes = rng.lognormal(np.log(mean), 0.5, size=n)
+    return np.clip(sizes, min_size, max_size).round(2)
 
 
-def generate_trades_for_profile(profile_key, num_trades=100):
-    """Generate trades for a specific investor profile"""
-    profile = PROFILES[profile_key]
-    
-    print(f"\n{'='*80}")
-    print(f"Generating {num_trades} trades for: {profile['name']}")
-    print(f"{'='*80}")
-    
-    # Base prices for common stocks (approximate real values)
-    base_prices = {
-        'AAPL': 275, 'MSFT': 485, 'GOOGL': 195, 'AMZN': 225, 'META': 650,
-        'NVDA': 875, 'TSLA': 385, 'AMD': 135, 'JPM': 240, 'BAC': 45,
-        'JNJ': 160, 'PFE': 26, 'XOM': 110, 'COIN': 235, 'PLTR': 70,
-        'SNOW': 165, 'RIVN': 12, 'ARKK': 48, 'SOFI': 15, 'HOOD': 32,
-        'NIO': 4, 'SPY': 600, 'VTI': 285, 'QQQ': 525, 'VOO': 555,
-        'VIG': 205, 'BND': 70, 'PG': 170, 'KO': 62, 'T': 22
-    }
+def sample_trades(profile, num_trades, rng=None):
+    """Sample trades for a profile, sorted by entry date (no database access)"""
+    if rng is None:
+        rng = _rng
     
     # Date range: last 6 months
     end_date = datetime.now()
     start_date = end_date - timedelta(days=180)
+    days_between = (end_date - start_date).days
+    
+    # Draw every trade's random components in one batch per field
+    symbols_idx = rng.choice(len(profile['_symbols']), size=num_trades, p=profile['_weights'])
+    sizes = generate_position_size(profile, n=num_trades, rng=rng)
+    price_var = rng.uniform(-0.20, 0.20, size=num_trades)
+    beta_var = rng.uniform(-0.1, 0.1, size=num_trades)
+    day_offsets = rng.integers(0, days_between + 1, size=num_trades)
     
-    trades_data = []
-    
-    for i in range(num_trades):
-        # Select stock
-        symbol, stock_info = select_stock(profile)
-        
-        # Generate trade parameters
-        position_size = generate_position_size(profile)
-        entry_price = generate_entry_price(symbol, base_prices)
-        entry_date = generate_entry_date(start_date, end_date)
-        
-        # Add some variation to beta (±10%)
-        beta_variation = random.uniform(-0.1, 0.1)
-        stock_beta = round(stock_info['beta'] * (1 + beta_variation), 2)
-        
-        trades_data.append({
+    # Build entry dates as datetime64[D]; str() of a [D] value is already YYYY-MM-DD
+    entry_dates = np.datetime64(start_date.date()) + day_offsets.astype('timedelta64[D]')
+    
+    # Gather per-trade stock attributes from the profile's column arrays
+    entry_prices = np.round(profile['_base_prices'][symbols_idx] * (1 + price_var), 2)
+    betas = np.round(profile['_betas'][symbols_idx] * (1 + beta_var), 2)
+    
+    # Emit trades sorted by date
+    order = np.argsort(entry_dates, kind='stable')
+    trades_data = [
+        {
             'symbol': symbol,
             'entry_price': entry_price,
-            'entry_date': entry_date.strftime('%Y-%m-%d'),
+            'entry_date': entry_date,
             'horizon': profile['horizon_days'],
             'position_size': position_size,
             'stock_beta': stock_beta,
-            'sector': stock_info['sector']
-        })
+            'sector': sector
+        }
+        for symbol, entry_price, entry_date, position_size, stock_beta, sector in zip(
+            profile['_symbols'][symbols_idx][order].tolist(),
+            entry_prices[order].tolist(),
+            entry_dates[order].astype(str).tolist(),
+            sizes[order].tolist(),
+            betas[order].tolist(),
+            profile['_sectors'][symbols_idx][order].tolist()
+        )
+    ]
     
-    # Sort by date
-    trades_data.sort(key=lambda x: x['entry_date'])
+    return trades_data, sizes, betas
+
+
+def save_profile_trades(profile, trades_data, sizes, betas):
+    """Save sampled trades for a profile and print a summary"""
+    num_trades = len(trades_data)
     
-    # Save to database
-    trade_ids = []
-    for i, trade in enumerate(trades_data, 1):
-        trade_id = save_trade(**trade)
-        trade_ids.append(trade_id)
-        if i % 20 == 0:
-            print(f"  Saved {i}/{num_trades} trades...")
+    print(f"\n{'='*80}")
+    print(f"Generating {num_trades} trades for: {profile['name']}")
+    print(f"{'='*80}")
+    
+    # Save to database in one transaction (save_trades_bulk chunks the inserts itself)
+    trade_ids = save_trades_bulk(trades_data)
     
     print(f"✅ Completed! Saved {num_trades} trades (IDs: {trade_ids[0]}-{trade_ids[-1]})")
     
     # Print summary statistics
     print(f"\nProfile Summary:")
-    print(f"  Avg Position Size: ${np.mean([t['position_size'] for t in trades_data]):,.2f}")
-    print(f"  Position Size Range: ${min([t['position_size'] for t in trades_data]):,.2f} - ${max([t['position_size'] for t in trades_data]):,.2f}")
-    print(f"  Avg Beta: {np.mean([t['stock_beta'] for t in trades_data]):.2f}")
-    print(f"  Beta Range: {min([t['stock_beta'] for t in trades_data]):.2f} - {max([t['stock_beta'] for t in trades_data]):.2f}")
+    print(f"  Avg Position Size: ${sizes.mean():,.2f}")
+    print(f"  Position Size Range: ${sizes.min():,.2f} - ${sizes.max():,.2f}")
+    print(f"  Avg Beta: {betas.mean():.2f}")
+    print(f"  Beta Range: {betas.min():.2f} - {betas.max():.2f}")
     
     # Count by sector
-    sectors = {}
-    for trade in trades_data:
-        sector = trade['sector']
-        sectors[sector] = sectors.get(sector, 0) + 1
+    sector_counts = Counter(trade['sector'] for trade in trades_data)
     print(f"  Sector Distribution:")
-    for sector, count in sorted(sectors.items(), key=lambda x: -x[1]):
+    for sector, count in sector_counts.most_common():
         print(f"    {sector}: {count} trades ({count/num_trades*100:.1f}%)")
     
     return trade_ids
 
 
+def generate_trades_for_profile(profile_key, num_trades=100, rng=None):
+    """Generate trades for a specific investor profile"""
+    profile = PROFILES[profile_key]
+    trades_data, sizes, betas = sample_trades(profile, num_trades, rng)
+    return save_profile_trades(profile, trades_data, sizes, betas)
+
+
 def main():
     """Generate all test datasets"""
     print("Initializing database...")
@@ -217,12 +223,17 @@ def main():
     print("\nStarting test data generation...")
     print("="*80)
     
-    all_trade_ids = {}
+    profile_keys = ['institutional', 'retail_speculative', 'retail_conservative']
     
-    # Generate trades for each profile
-    for profile_key in ['institutional', 'retail_speculative', 'retail_conservative']:
-        trade_ids = generate_trades_for_profile(profile_key, num_trades=100)
-        all_trade_ids[profile_key] = trade_ids
+    # Sample each profile from its own independent stream, saving in profile
+    # order so each profile gets a predictable ID range
+    seeds = np.random.SeedSequence(42).spawn(len(profile_keys))
+    all_trade_ids = {
+        key: save_profile_trades(
+            PROFILES[key], *sample_trades(PROFILES[key], 100, np.random.default_rng(seed))
+        )
+        for key, seed in zip(profile_keys, seeds)
+    }
     
     # Final summary
     print("\n" + "="*80)
@@ -245,6 +256,8 @@ def main():
     print("\n" + "="*80)
     print("You can now test behavioral analysis with these realistic datasets!")
     print("="*80)
+    
+    close_db_connections()
 
 
 if __name__ == "__main__":
@@ -6,18 +6,43 @@ Analyze trades and provide coaching feedback based on timing and behavioral patt
 """
 
 import argparse
+import os
 import sys
+import traceback
 from datetime import datetime
 from typing import Optional
 
-from src.coach_logic import analyze_trade_timing, detect_behavioral_anomaly
-from src.database import (
-    init_database, 
-    save_trade, 
-    save_analysis_result,
-    get_trades_for_behavioral_analysis
+
+_SEP_EQ = "=" * 80
+_SEP_DASH = "-" * 80
+
+# (upper bound on entry timing score, advice lines), checked in order
+_TIMING_ADVICE = (
+    (-5, (
+        "⚠️  Entry Timing: Consider using limit orders at support levels rather than market orders.",
+        "   Practice patience and wait for pullbacks before entering positions.",
+    )),
+    (-2, (
+        "✓ Entry Timing: Your timing is acceptable but can be improved with better technical analysis.",
+    )),
+    (float('inf'), (
+        "✅ Entry Timing: Excellent execution! Keep using your current entry strategy.",
+    )),
 )
-from src.mock_data import generate_mock_historical_data
+
+# (anomaly type, z-score above +2) -> advice lines
+_ANOMALY_ADVICE = {
+    ('position_size', True): (
+        "⚠️  Position Size: You're risking more than usual. Ensure this is intentional.",
+    ),
+    ('position_size', False): (
+        "ℹ️  Position Size: Unusually small position. Consider if you're being too cautious.",
+    ),
+    ('stock_beta', True): (
+        "⚠️  Risk Profile: This stock is significantly more volatile than your typical picks.",
+        "   Consider reducing position size to maintain consistent risk exposure.",
+    ),
+}
 
 
 def parse_arguments():
@@ -99,6 +124,12 @@ Examples:
         help='Use mock data instead of Tiger API (for testing)'
     )
     
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Print full tracebacks on unexpected errors (or set TRADING_COACH_DEBUG=1)'
+    )
+    
     return parser.parse_args()
 
 
@@ -135,6 +166,32 @@ def print_coaching_report(
     """
     Print a comprehensive coaching report to the terminal.
     
+    The report is built by _format_report and written with a single call.
+    
+    Args:
+        symbol: Stock symbol
+        entry_price: Entry price
+        entry_date: Entry date
+        timing_analysis: Results from analyze_trade_timing
+        behavioral_analysis: Results from detect_behavioral_anomaly (optional)
+        trade_id: Database ID of the saved trade (optional)
+    """
+    sys.stdout.write(_format_report(
+        symbol, entry_price, entry_date, timing_analysis, behavioral_analysis, trade_id
+    ))
+
+
+def _format_report(
+    symbol: str,
+    entry_price: float,
+    entry_date: str,
+    timing_analysis: dict,
+    behavioral_analysis: Optional[dict] = None,
+    trade_id: Optional[int] = None
+) -> str:
+    """
+    Build the coaching report printed by print_coaching_report.
+    
     Args:
         symbol: Stock symbol
         entry_price: Entry price
@@ -142,30 +199,35 @@ def print_coaching_report(
         timing_analysis: Results from analyze_trade_timing
         behavioral_analysis: Results from detect_behavioral_anomaly (optional)
         trade_id: Database ID of the saved trade (optional)
+        
+    Returns:
+        The full report text, ending with a newline
     """
-    print("\n" + "=" * 80)
-    print(" " * 25 + "🎯 TRADING COACH REPORT")
-    print("=" * 80)
+    lines = []
+    
+    lines.append("\n" + _SEP_EQ)
+    lines.append(" " * 25 + "🎯 TRADING COACH REPORT")
+    lines.append(_SEP_EQ)
     
     # Trade Summary
-    print("\n📊 TRADE SUMMARY")
-    print("-" * 80)
-    print(f"  Symbol:           {symbol}")
-    print(f"  Entry Price:      ${entry_price:.2f}")
-    print(f"  Entry Date:       {entry_date}")
+    lines.append("\n📊 TRADE SUMMARY")
+    lines.append(_SEP_DASH)
+    lines.append(f"  Symbol:           {symbol}")
+    lines.append(f"  Entry Price:      ${entry_price:.2f}")
+    lines.append(f"  Entry Date:       {entry_date}")
     if trade_id:
-        print(f"  Trade ID:         #{trade_id}")
+        lines.append(f"  Trade ID:         #{trade_id}")
     
     # Timing Analysis
-    print("\n⏱️  TIMING EFFICIENCY ANALYSIS")
-    print("-" * 80)
+    lines.append("\n⏱️  TIMING EFFICIENCY ANALYSIS")
+    lines.append(_SEP_DASH)
     
     ideal_entry = timing_analysis['ideal_entry']
     entry_score = timing_analysis['entry_timing_score']
     
-    print(f"  Actual Entry:     ${entry_price:.2f}")
-    print(f"  Ideal Entry:      ${ideal_entry:.2f} (lowest price in period)")
-    print(f"  Timing Score:     {entry_score:.2f}%")
+    lines.append(f"  Actual Entry:     ${entry_price:.2f}")
+    lines.append(f"  Ideal Entry:      ${ideal_entry:.2f} (lowest price in period)")
+    lines.append(f"  Timing Score:     {entry_score:.2f}%")
     
     # Timing verdict
     if entry_score >= -1:
@@ -181,77 +243,71 @@ def print_coaching_report(
         verdict = "❌ POOR - Significant timing improvement needed"
         color = "red"
     
-    print(f"  Verdict:          {verdict}")
+    lines.append(f"  Verdict:          {verdict}")
     
     if entry_score < 0:
-        print(f"\n  💡 You entered {abs(entry_score):.2f}% above the ideal price.")
-        print(f"     Waiting for better entry could have saved ${entry_price - ideal_entry:.2f} per share.")
+        lines.append(f"\n  💡 You entered {abs(entry_score):.2f}% above the ideal price.")
+        lines.append(f"     Waiting for better entry could have saved ${entry_price - ideal_entry:.2f} per share.")
     else:
-        print(f"\n  🎉 Great job! You entered at an excellent price point.")
+        lines.append(f"\n  🎉 Great job! You entered at an excellent price point.")
     
     # MFE/MAE Analysis
-    print(f"\n  Peak Potential:   ${timing_analysis['mfe']:.2f} (+{timing_analysis['mfe_percent']:.2f}%)")
-    print(f"  Maximum Risk:     ${timing_analysis['mae']:.2f} ({timing_analysis['mae_percent']:.2f}%)")
-    print(f"  Missed Profit:    {timing_analysis['missed_profit_potential']:.2f}%")
+    lines.append(f"\n  Peak Potential:   ${timing_analysis['mfe']:.2f} (+{timing_analysis['mfe_percent']:.2f}%)")
+    lines.append(f"  Maximum Risk:     ${timing_analysis['mae']:.2f} ({timing_analysis['mae_percent']:.2f}%)")
+    lines.append(f"  Missed Profit:    {timing_analysis['missed_profit_potential']:.2f}%")
     
     if timing_analysis['missed_profit_potential'] > 5:
-        print(f"     ⚠️  Better entry timing could have captured {timing_analysis['missed_profit_potential']:.2f}% more profit")
+        lines.append(f"     ⚠️  Better entry timing could have captured {timing_analysis['missed_profit_potential']:.2f}% more profit")
     
     # Behavioral Analysis
     if behavioral_analysis:
-        print("\n🧠 BEHAVIORAL PATTERN ANALYSIS")
-        print("-" * 80)
+        lines.append("\n🧠 BEHAVIORAL PATTERN ANALYSIS")
+        lines.append(_SEP_DASH)
         
         if behavioral_analysis['is_anomaly']:
-            print("  Status:           ⚠️  ANOMALIES DETECTED")
-            print(f"\n  {len(behavioral_analysis['anomalies'])} behavioral anomaly(ies) found:\n")
+            lines.append("  Status:           ⚠️  ANOMALIES DETECTED")
+            lines.append(f"\n  {len(behavioral_analysis['anomalies'])} behavioral anomaly(ies) found:\n")
             
             for i, anomaly in enumerate(behavioral_analysis['anomalies'], 1):
-                print(f"  {i}. {anomaly['type'].upper().replace('_', ' ')}")
-                print(f"     Current:       {anomaly['current_value']}")
-                print(f"     Historical:    {anomaly['historical_mean']} (mean)")
-                print(f"     Z-Score:       {anomaly['z_score']}")
-                print(f"     ⚠️  {anomaly['message']}")
-                print()
+                lines.append(f"  {i}. {anomaly['type'].upper().replace('_', ' ')}")
+                lines.append(f"     Current:       {anomaly['current_value']}")
+                lines.append(f"     Historical:    {anomaly['historical_mean']} (mean)")
+                lines.append(f"     Z-Score:       {anomaly['z_score']}")
+                lines.append(f"     ⚠️  {anomaly['message']}")
+                lines.append("")
         else:
-            print("  Status:           ✅ NORMAL - Trade is within your typical patterns")
+            lines.append("  Status:           ✅ NORMAL - Trade is within your typical patterns")
         
         # Display warnings
         if behavioral_analysis['warnings']:
-            print("  Warnings:")
+            lines.append("  Warnings:")
             for warning in behavioral_analysis['warnings']:
                 if isinstance(warning, dict):
-                    print(f"    🔔 {warning['message']}")
+                    lines.append(f"    🔔 {warning['message']}")
                     if 'known_sectors' in warning:
-                        print(f"       Known sectors: {', '.join(warning['known_sectors'])}")
+                        lines.append(f"       Known sectors: {', '.join(warning['known_sectors'])}")
                 else:
-                    print(f"    ℹ️  {warning}")
+                    lines.append(f"    ℹ️  {warning}")
         
         # Display metrics
         if behavioral_analysis['metrics']:
-            print("\n  Your Trading Profile (Based on History):")
+            lines.append("\n  Your Trading Profile (Based on History):")
             metrics = behavioral_analysis['metrics']
             if 'position_size_mean' in metrics:
-                print(f"    Avg Position Size: ${metrics['position_size_mean']:,.2f} " +
-                      f"(±${metrics.get('position_size_std', 0):,.2f})")
+                lines.append(f"    Avg Position Size: ${metrics['position_size_mean']:,.2f} " +
+                             f"(±${metrics.get('position_size_std', 0):,.2f})")
             if 'stock_beta_mean' in metrics:
-                print(f"    Avg Stock Beta:    {metrics['stock_beta_mean']:.2f} " +
-                      f"(±{metrics.get('stock_beta_std', 0):.2f})")
+                lines.append(f"    Avg Stock Beta:    {metrics['stock_beta_mean']:.2f} " +
+                             f"(±{metrics.get('stock_beta_std', 0):.2f})")
     
     # Overall Coaching Advice
-    print("\n💼 COACHING ADVICE")
-    print("-" * 80)
+    lines.append("\n💼 COACHING ADVICE")
+    lines.append(_SEP_DASH)
     
     advice = []
     
-    # Timing advice
-    if entry_score < -5:
-        advice.append("⚠️  Entry Timing: Consider using limit orders at support levels rather than market orders.")
-        advice.append("   Practice patience and wait for pullbacks before entering positions.")
-    elif entry_score < -2:
-        advice.append("✓ Entry Timing: Your timing is acceptable but can be improved with better technical analysis.")
-    else:
-        advice.append("✅ Entry Timing: Excellent execution! Keep using your current entry strategy.")
+    # Timing advice: first band whose upper bound exceeds the score
+    advice.extend(next(msgs for upper, msgs in _TIMING_ADVICE if entry_score < upper))
     
     # Risk management advice
     if timing_analysis['mae_percent'] < -10:
@@ -261,30 +317,35 @@ def print_coaching_report(
     # Behavioral advice
     if behavioral_analysis and behavioral_analysis['is_anomaly']:
         for anomaly in behavioral_analysis['anomalies']:
-            if anomaly['type'] == 'position_size':
-                if anomaly['z_score'] > 2:
-                    advice.append("⚠️  Position Size: You're risking more than usual. Ensure this is intentional.")
-                else:
-                    advice.append("ℹ️  Position Size: Unusually small position. Consider if you're being too cautious.")
-            elif anomaly['type'] == 'stock_beta':
-                if anomaly['z_score'] > 2:
-                    advice.append("⚠️  Risk Profile: This stock is significantly more volatile than your typical picks.")
-                    advice.append("   Consider reducing position size to maintain consistent risk exposure.")
+            advice.extend(_ANOMALY_ADVICE.get((anomaly['type'], anomaly['z_score'] > 2), ()))
     
     if not advice:
         advice.append("✅ Overall: This trade aligns well with your profile. Continue executing with discipline!")
     
     for line in advice:
-        print(f"  {line}")
+        lines.append(f"  {line}")
+    
+    lines.append("\n" + _SEP_EQ)
+    lines.append("")
     
-    print("\n" + "=" * 80)
-    print()
+    return "\n".join(lines) + "\n"
 
 
 def main():
     """Main entry point for the Trading Coach application."""
     args = parse_arguments()
     
+    # Imported after argument parsing so --help and usage errors skip pandas/numpy
+    from src.coach_logic import analyze_trade_timing, detect_behavioral_anomaly
+    from src.database import (
+        init_database, 
+        save_trade, 
+        save_analysis_result,
+        get_trades_for_behavioral_analysis_soa,
+        close_db_connections
+    )
+    from src.mock_data import generate_mock_historical_data
+    
     try:
         # Initialize database if requested
         if args.init_db:
@@ -333,9 +394,9 @@ def main():
             print(f"🧠 Analyzing behavioral patterns...")
             
             # Get trade history for comparison
-            trade_history = get_trades_for_behavioral_analysis(50)
+            trade_history = get_trades_for_behavioral_analysis_soa(50)
             
-            if trade_history:
+            if len(trade_history['sector']) > 0:
                 current_trade = {
                     'position_size': args.position_size,
                     'stock_beta': args.beta,
@@ -352,7 +413,7 @@ def main():
             trade_id = save_trade(
                 symbol=args.symbol,
                 entry_price=args.price,
-                entry_date=args.date,
+                entry_date=entry_date,
                 horizon=args.horizon,
                 position_size=args.position_size,
                 stock_beta=args.beta,
@@ -360,7 +421,7 @@ def main():
             )
             
             # Save analyses
-            save_analysis_result(trade_id, 'timing', timing_analysis)
+            save_analysis_result(trade_id, 'timing', timing_analysis.as_dict())
             if behavioral_analysis:
                 save_analysis_result(trade_id, 'behavioral', behavioral_analysis)
         
@@ -382,9 +443,11 @@ def main():
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        if args.verbose or os.getenv('TRADING_COACH_DEBUG'):
+            traceback.print_exc()
         sys.exit(1)
+    finally:
+        close_db_connections()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,131 @@
 """Trading Coach Logic - Analyze trade timing and execution quality"""
 
-import pandas as pd
+from __future__ import annotations
+
 import numpy as np
+import math
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Union, List
+from typing import TYPE_CHECKING, Dict, Union, List, Tuple
+
+if TYPE_CHECKING:
+    # pandas is imported lazily by the functions that work on price frames,
+    # so formatting and behavioral analysis don't pay for it at import
+    import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; NumPy fallbacks are used without it
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _mfe_mae_kernel(high, low):
+        # One pass, three accumulators; NaNs never compare greater/less so are skipped
+        hi = -np.inf
+        lo = np.inf
+        lo_i = 0
+        for i in range(high.shape[0]):
+            h = high[i]
+            l = low[i]
+            if h > hi:
+                hi = h
+            if l < lo:
+                lo = l
+                lo_i = i
+        return hi, lo, lo_i
+
+    def _mfe_mae(high: np.ndarray, low: np.ndarray):
+        """Return (max of high, min of low, position of that low) in a single fused scan."""
+        return _mfe_mae_kernel(
+            np.ascontiguousarray(high, dtype=np.float64),
+            np.ascontiguousarray(low, dtype=np.float64)
+        )
+else:
+    def _mfe_mae(high: np.ndarray, low: np.ndarray):
+        """Return (max of high, min of low, position of that low), ignoring NaNs."""
+        lo_i = int(np.argmin(np.where(np.isnan(low), np.inf, low)))
+        return np.nanmax(high), np.nanmin(low), lo_i
+
+
+def prepare_historical(df_historical: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepare a historical price frame once for repeated timing analysis.
+    
+    Returns a copy with the 'date' column converted to datetime64, the price
+    columns stored as float64 and rows sorted by date, so analyze_trade_timing
+    can use it as-is (no conversion, zero-copy contiguous price arrays,
+    binary-search slicing) however many entries are analyzed against it.
+    
+    Args:
+        df_historical: DataFrame with columns: date, open, high, low, close, volume
+    
+    Returns:
+        Prepared DataFrame sorted by date with a fresh index
+    """
+    import pandas as pd
+    
+    df = df_historical.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    
+    # Store price columns as float64 so analysis reads them as zero-copy ndarrays
+    for column in ('high', 'low'):
+        df[column] = df[column].to_numpy(dtype=np.float64)
+    df.sort_values('date', inplace=True, kind='stable')
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+# Keys of the analyze_trade_timing result, in output order
+_TIMING_KEYS = (
+    'mfe',
+    'mae',
+    'mfe_percent',
+    'mae_percent',
+    'ideal_entry',
+    'entry_timing_score',
+    'missed_profit_potential'
+)
+
+
+@dataclass
+class TradeTimingResult:
+    """
+    Result of analyze_trade_timing, every value rounded to 2 decimals.
+    
+    Slotted so each analysis allocates one fixed-size object. Supports
+    result['mfe'] style access like the dict it replaces; use as_dict() where
+    a real dict is needed (e.g. JSON serialization). ideal_entry_date, the
+    date of the ideal entry (the bar with the MAE low), is an attribute only
+    and is not part of the dict view.
+    """
+    __slots__ = _TIMING_KEYS + ('ideal_entry_date',)
+    mfe: float
+    mae: float
+    mfe_percent: float
+    mae_percent: float
+    ideal_entry: float
+    entry_timing_score: float
+    missed_profit_potential: float
+    ideal_entry_date: np.datetime64
+    
+    def __getitem__(self, key: str) -> float:
+        if key not in _TIMING_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def as_dict(self) -> Dict[str, float]:
+        """Return the metrics as a plain dictionary"""
+        return {key: getattr(self, key) for key in _TIMING_KEYS}
 
 
 def analyze_trade_timing(
     entry_price: float,
-    entry_date: Union[str, datetime],
+    entry_date: Union[str, datetime, np.datetime64],
     df_historical: pd.DataFrame
-) -> Dict[str, float]:
+) -> TradeTimingResult:
     """
     Analyze trade timing by calculating Maximum Favorable/Adverse Excursion.
     
@@ -20,11 +135,14 @@ def analyze_trade_timing(
     
     Args:
         entry_price: The actual price at which the trade was entered
-        entry_date: The date when the trade was entered (string or datetime)
-        df_historical: DataFrame with columns: date, open, high, low, close, volume
+        entry_date: The date when the trade was entered (string, datetime,
+                    pd.Timestamp or np.datetime64)
+        df_historical: DataFrame with columns: date, open, high, low, close, volume.
+                       The frame is never copied; pass it through prepare_historical
+                       first when analyzing many entries against the same data
     
     Returns:
-        Dictionary containing:
+        TradeTimingResult (indexable like a dictionary) containing:
             - 'mfe': Maximum Favorable Excursion (highest price reached)
             - 'mae': Maximum Adverse Excursion (lowest price reached)
             - 'mfe_percent': Percentage gain from entry to MFE
@@ -33,105 +151,318 @@ def analyze_trade_timing(
             - 'entry_timing_score': Percentage difference between actual and ideal entry
             - 'missed_profit_potential': Percentage of profit that could have been captured
                                         if entered at ideal price and exited at MFE
+        and the ideal_entry_date attribute (np.datetime64 of the MAE bar).
     
     Example:
         >>> df = get_historical_data('AAPL', 30)
         >>> result = analyze_trade_timing(150.00, '2025-12-01', df)
         >>> print(f"Entry timing score: {result['entry_timing_score']:.2f}%")
     """
-    # Convert entry_date to datetime if it's a string
-    if isinstance(entry_date, str):
-        entry_date = pd.to_datetime(entry_date)
-    
-    # Ensure df_historical date column is datetime
-    df = df_historical.copy()
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # Filter DataFrame to start from entry_date
-    df_filtered = df[df['date'] >= entry_date].reset_index(drop=True)
+    import pandas as pd
+    
+    # Work on the raw date values; only convert when the column isn't datetime yet
+    date_col = df_historical['date']
+    if not pd.api.types.is_datetime64_any_dtype(date_col):
+        date_col = pd.to_datetime(date_col, cache=True)
+    dates = date_col.values
+    highs = df_historical['high'].to_numpy(dtype=np.float64)
+    lows = df_historical['low'].to_numpy(dtype=np.float64)
+    
+    # Normalize entry_date once; datetime64 values are used as-is
+    if isinstance(entry_date, np.datetime64):
+        entry_np = entry_date
+    else:
+        entry_np = np.datetime64(pd.Timestamp(entry_date))
+    
+    # Select rows from entry_date onwards: binary search when sorted (the
+    # normal case for bar data), boolean mask otherwise
+    if date_col.is_monotonic_increasing:
+        start = np.searchsorted(dates, entry_np)
+        dates = dates[start:]
+        highs = highs[start:]
+        lows = lows[start:]
+    else:
+        mask = dates >= entry_np
+        dates = dates[mask]
+        highs = highs[mask]
+        lows = lows[mask]
     
-    if len(df_filtered) == 0:
+    if len(highs) == 0:
         raise ValueError(
-            f"No data available from entry_date {entry_date}. "
-            f"Historical data range: {df['date'].min()} to {df['date'].max()}"
+            f"No data available from entry_date {pd.Timestamp(entry_np)}. "
+            f"Historical data range: {date_col.min()} to {date_col.max()}"
         )
     
-    # Calculate Maximum Favorable Excursion (MFE) - highest price reached
-    mfe = df_filtered['high'].max()
-    
-    # Calculate Maximum Adverse Excursion (MAE) - lowest price reached
-    mae = df_filtered['low'].min()
+    # Maximum Favorable Excursion (MFE) - highest price reached, and
+    # Maximum Adverse Excursion (MAE) - lowest price reached, plus where it was
+    mfe, mae, mae_index = _mfe_mae(highs, lows)
     
     # Ideal entry would be the lowest price in the period
     ideal_entry = mae
     
-    # Calculate percentage metrics
-    mfe_percent = ((mfe - entry_price) / entry_price) * 100
-    mae_percent = ((mae - entry_price) / entry_price) * 100
+    # Calculate percentage metrics, scaling by precomputed reciprocals
+    entry_scale = 100.0 / entry_price
+    mfe_percent = (mfe - entry_price) * entry_scale
+    mae_percent = (mae - entry_price) * entry_scale
     
     # Entry timing score: how much worse was actual entry vs ideal entry
     # Negative value means entered above ideal, positive means below (better than ideal)
-    entry_timing_score = ((ideal_entry - entry_price) / entry_price) * 100
+    # Since the ideal entry is the MAE, this is the same figure as mae_percent
+    entry_timing_score = mae_percent
     
     # Missed profit potential: the additional profit that could have been captured
     # if entered at the ideal price (MAE) and exited at the best price (MFE)
-    ideal_profit = ((mfe - ideal_entry) / ideal_entry) * 100
+    ideal_profit = (mfe - ideal_entry) * (100.0 / ideal_entry)
     actual_profit_potential = mfe_percent
     missed_profit_potential = ideal_profit - actual_profit_potential
     
-    return {
-        'mfe': round(mfe, 2),
-        'mae': round(mae, 2),
-        'mfe_percent': round(mfe_percent, 2),
-        'mae_percent': round(mae_percent, 2),
-        'ideal_entry': round(ideal_entry, 2),
-        'entry_timing_score': round(entry_timing_score, 2),
-        'missed_profit_potential': round(missed_profit_potential, 2)
-    }
+    # Round every metric in one vectorized call
+    values = np.round(np.array([
+        mfe,
+        mae,
+        mfe_percent,
+        mae_percent,
+        ideal_entry,
+        entry_timing_score,
+        missed_profit_potential
+    ], dtype=np.float64), 2)
+    return TradeTimingResult(*values.tolist(), dates[mae_index])
+
 
+# Report rules shared by the text formatters
+_HR = "=" * 60
+_HR_FOOTER = "\n" + _HR
 
-def format_trade_analysis(analysis: Dict[str, float], entry_price: float) -> str:
+
+def format_trade_analysis(analysis: TradeTimingResult, entry_price: float) -> str:
     """
     Format the trade analysis results into a human-readable report.
     
     Args:
-        analysis: Dictionary returned from analyze_trade_timing
+        analysis: Result returned from analyze_trade_timing
         entry_price: The actual entry price
     
     Returns:
         Formatted string report
     """
-    report = []
-    report.append("=" * 60)
-    report.append("TRADE TIMING ANALYSIS")
-    report.append("=" * 60)
-    report.append(f"\nActual Entry Price: ${entry_price:.2f}")
-    report.append(f"Ideal Entry Price:  ${analysis['ideal_entry']:.2f}")
-    report.append(f"Entry Timing Score: {analysis['entry_timing_score']:.2f}%")
-    
-    if analysis['entry_timing_score'] < 0:
-        report.append(f"  → You entered {abs(analysis['entry_timing_score']):.2f}% above the ideal entry")
+    score = analysis['entry_timing_score']
+    ideal_entry = analysis['ideal_entry']
+    if score < 0:
+        verdict = f"  → You entered {abs(score):.2f}% above the ideal entry"
     else:
-        report.append(f"  → You entered {analysis['entry_timing_score']:.2f}% below the ideal entry (great timing!)")
-    
-    report.append(f"\nMaximum Favorable Excursion (MFE): ${analysis['mfe']:.2f}")
-    report.append(f"  → Peak profit potential: {analysis['mfe_percent']:.2f}%")
-    
-    report.append(f"\nMaximum Adverse Excursion (MAE): ${analysis['mae']:.2f}")
-    report.append(f"  → Maximum drawdown: {analysis['mae_percent']:.2f}%")
+        verdict = f"  → You entered {score:.2f}% below the ideal entry (great timing!)"
+    
+    return "\n".join((
+        _HR,
+        "TRADE TIMING ANALYSIS",
+        _HR,
+        f"\nActual Entry Price: ${entry_price:.2f}",
+        f"Ideal Entry Price:  ${ideal_entry:.2f}",
+        f"Entry Timing Score: {score:.2f}%",
+        verdict,
+        f"\nMaximum Favorable Excursion (MFE): ${analysis['mfe']:.2f}",
+        f"  → Peak profit potential: {analysis['mfe_percent']:.2f}%",
+        f"\nMaximum Adverse Excursion (MAE): ${analysis['mae']:.2f}",
+        f"  → Maximum drawdown: {analysis['mae_percent']:.2f}%",
+        f"\nMissed Profit Potential: {analysis['missed_profit_potential']:.2f}%",
+        "  → This is the additional profit you could have captured",
+        f"    with better entry timing (entering at ${ideal_entry:.2f})",
+        _HR_FOOTER
+    ))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _moments(values):
+        # Welford's algorithm in a single sweep; NaN marks a missing value and is skipped
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(values.shape[0]):
+            x = values[i]
+            if np.isnan(x):
+                continue
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+        return n, mean, m2
+else:
+    def _moments(values: np.ndarray) -> Tuple[int, float, float]:
+        """Return (count, mean, sum of squared deviations), ignoring NaNs."""
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return 0, 0.0, 0.0
+        mean = values.mean()
+        # Sum the squared deviations with a dot product so the squares never
+        # get their own temporary array
+        deviations = values - mean
+        return n, mean, float(np.dot(deviations, deviations))
+
+
+# Histories shorter than this are summarized in plain Python, where NumPy's
+# per-call overhead would outweigh the arithmetic itself
+_SMALL_HISTORY = 64
+
+
+def _moments_small(values: List[float]) -> Tuple[int, float, float]:
+    """Return (count, mean, sum of squared deviations) of a short list."""
+    n = len(values)
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = sum(values) / n
+    m2 = 0.0
+    for value in values:
+        delta = value - mean
+        m2 += delta * delta
+    return n, mean, m2
+
+
+@dataclass
+class BehavioralStats:
+    """
+    Running statistics of a trade history for behavioral anomaly detection.
     
-    report.append(f"\nMissed Profit Potential: {analysis['missed_profit_potential']:.2f}%")
-    report.append(f"  → This is the additional profit you could have captured")
-    report.append(f"    with better entry timing (entering at ${analysis['ideal_entry']:.2f})")
+    Keeps the count, mean and sum of squared deviations (m2) of position size
+    and stock beta, plus the set of traded sectors (interned, so each sector
+    name is stored once and compares by identity). New trades are folded in
+    with update() using Welford's online algorithm, so the history never has
+    to be rescanned between detect_behavioral_anomaly calls.
     
-    report.append("\n" + "=" * 60)
+    Example:
+        >>> stats = BehavioralStats.from_history(get_trades_for_behavioral_analysis(50))
+        >>> result = detect_behavioral_anomaly(current, stats)
+        >>> stats.update(current)  # after the trade is placed
+    """
+    n_trades: int = 0
+    n_pos: int = 0
+    mean_pos: float = 0.0
+    m2_pos: float = 0.0
+    n_beta: int = 0
+    mean_beta: float = 0.0
+    m2_beta: float = 0.0
+    sectors: set = field(default_factory=set)
+    
+    @classmethod
+    def from_history(
+        cls,
+        trade_history: Union[List[Dict], Dict[str, np.ndarray]]
+    ) -> 'BehavioralStats':
+        """
+        Build statistics from a full trade history in one batch.
+        
+        Args:
+            trade_history: List of trade dictionaries, or a dict of column arrays
+                           (as returned by get_trades_for_behavioral_analysis_soa)
+        
+        Returns:
+            BehavioralStats summarizing the history
+        """
+        # Extract historical data as column arrays
+        if isinstance(trade_history, dict):
+            n_trades = len(trade_history.get('sector', ()))
+            if n_trades == 0:
+                return cls()
+            position_sizes = np.asarray(trade_history['position_size'], dtype=np.float64)
+            stock_betas = np.asarray(trade_history['stock_beta'], dtype=np.float64)
+            sectors = set(map(sys.intern, np.asarray(trade_history['sector']).tolist()))
+            moments = _moments
+        elif len(trade_history) < _SMALL_HISTORY:
+            # Short histories stay in plain Python lists; missing values are skipped
+            n_trades = len(trade_history)
+            position_sizes = []
+            stock_betas = []
+            sectors = set()
+            for t in trade_history:
+                size = t.get('position_size')
+                beta = t.get('stock_beta')
+                sector = t.get('sector')
+                if size is not None:
+                    position_sizes.append(size)
+                if beta is not None:
+                    stock_betas.append(beta)
+                if sector is not None:
+                    sectors.add(sys.intern(sector))
+            moments = _moments_small
+        else:
+            # Single pass over the history into preallocated arrays; missing values become NaN
+            n_trades = len(trade_history)
+            position_sizes = np.empty(n_trades, dtype=np.float64)
+            stock_betas = np.empty(n_trades, dtype=np.float64)
+            sectors = set()
+            for i, t in enumerate(trade_history):
+                size = t.get('position_size')
+                beta = t.get('stock_beta')
+                sector = t.get('sector')
+                position_sizes[i] = np.nan if size is None else size
+                stock_betas[i] = np.nan if beta is None else beta
+                if sector is not None:
+                    sectors.add(sys.intern(sector))
+            moments = _moments
+        
+        # Missing (NaN) values are skipped so counts and sample statistics
+        # only see real data points
+        n_pos, mean_pos, m2_pos = moments(position_sizes)
+        n_beta, mean_beta, m2_beta = moments(stock_betas)
+        return cls(
+            n_trades=n_trades,
+            n_pos=n_pos,
+            mean_pos=mean_pos,
+            m2_pos=m2_pos,
+            n_beta=n_beta,
+            mean_beta=mean_beta,
+            m2_beta=m2_beta,
+            sectors=sectors
+        )
     
-    return "\n".join(report)
+    def update(self, trade: Dict) -> None:
+        """
+        Fold a single trade into the running statistics in O(1).
+        
+        Args:
+            trade: Trade dictionary with keys: 'position_size', 'stock_beta', 'sector'
+        """
+        self.n_trades += 1
+        
+        size = trade.get('position_size')
+        if size is not None:
+            self.n_pos += 1
+            delta = size - self.mean_pos
+            self.mean_pos += delta / self.n_pos
+            self.m2_pos += delta * (size - self.mean_pos)
+        
+        beta = trade.get('stock_beta')
+        if beta is not None:
+            self.n_beta += 1
+            delta = beta - self.mean_beta
+            self.mean_beta += delta / self.n_beta
+            self.m2_beta += delta * (beta - self.mean_beta)
+        
+        sector = trade.get('sector')
+        if sector is not None:
+            self.sectors.add(sys.intern(sector))
+    
+    @property
+    def std_pos(self) -> float:
+        """Sample standard deviation of position size (needs n_pos >= 2)"""
+        return math.sqrt(self.m2_pos / (self.n_pos - 1))
+    
+    @property
+    def std_beta(self) -> float:
+        """Sample standard deviation of stock beta (needs n_beta >= 2)"""
+        return math.sqrt(self.m2_beta / (self.n_beta - 1))
+
+
+# Anomaly wording indexed by (z_score > 0)
+_SIZE_DIRECTION = ("smaller", "larger")
+_BETA_DIRECTION = ("lower", "higher")
+_BETA_RISK = ("less risky", "riskier")
 
 
 def detect_behavioral_anomaly(
     current_trade: Dict,
-    trade_history: List[Dict]
+    trade_history: Union[List[Dict], Dict[str, np.ndarray], BehavioralStats]
 ) -> Dict:
     """
     Detect behavioral anomalies in trading patterns.
@@ -143,7 +474,10 @@ def detect_behavioral_anomaly(
     
     Args:
         current_trade: Dictionary with keys: 'position_size', 'stock_beta', 'sector'
-        trade_history: List of trade dictionaries with same keys as current_trade
+        trade_history: List of trade dictionaries with same keys as current_trade,
+                       a dict of column arrays with those keys (as returned by
+                       get_trades_for_behavioral_analysis_soa), or a prebuilt
+                       BehavioralStats for repeated calls against the same history
     
     Returns:
         Dictionary containing:
@@ -166,8 +500,12 @@ def detect_behavioral_anomaly(
     warnings = []
     metrics = {}
     
-    # Validate inputs
-    if not trade_history:
+    # Validate inputs; a prebuilt BehavioralStats skips rescanning the history
+    if isinstance(trade_history, BehavioralStats):
+        stats = trade_history
+    else:
+        stats = BehavioralStats.from_history(trade_history)
+    if stats.n_trades == 0:
         return {
             'is_anomaly': False,
             'anomalies': [],
@@ -177,19 +515,14 @@ def detect_behavioral_anomaly(
     
     # Required fields
     required_fields = ['position_size', 'stock_beta', 'sector']
-    for field in required_fields:
-        if field not in current_trade:
-            raise ValueError(f"current_trade missing required field: {field}")
-    
-    # Extract historical data
-    position_sizes = [t.get('position_size') for t in trade_history if t.get('position_size') is not None]
-    stock_betas = [t.get('stock_beta') for t in trade_history if t.get('stock_beta') is not None]
-    sectors = [t.get('sector') for t in trade_history if t.get('sector') is not None]
+    for name in required_fields:
+        if name not in current_trade:
+            raise ValueError(f"current_trade missing required field: {name}")
     
     # Check position size anomaly
-    if len(position_sizes) >= 2:  # Need at least 2 data points for std
-        mean_size = np.mean(position_sizes)
-        std_size = np.std(position_sizes, ddof=1)  # Sample standard deviation
+    if stats.n_pos >= 2:  # Need at least 2 data points for std
+        mean_size = stats.mean_pos
+        std_size = stats.std_pos  # Sample standard deviation
         
         metrics['position_size_mean'] = round(mean_size, 2)
         metrics['position_size_std'] = round(std_size, 2)
@@ -199,7 +532,7 @@ def detect_behavioral_anomaly(
             metrics['position_size_z_score'] = round(z_score_size, 2)
             
             if abs(z_score_size) > 2:
-                direction = "larger" if z_score_size > 0 else "smaller"
+                direction = _SIZE_DIRECTION[int(z_score_size > 0)]
                 anomalies.append({
                     'type': 'position_size',
                     'message': f"Position size is {abs(z_score_size):.2f} standard deviations {direction} than usual",
@@ -211,9 +544,9 @@ def detect_behavioral_anomaly(
         warnings.append('Insufficient trade history for position size analysis (need at least 2 trades)')
     
     # Check stock beta anomaly
-    if len(stock_betas) >= 2:
-        mean_beta = np.mean(stock_betas)
-        std_beta = np.std(stock_betas, ddof=1)
+    if stats.n_beta >= 2:
+        mean_beta = stats.mean_beta
+        std_beta = stats.std_beta
         
         metrics['stock_beta_mean'] = round(mean_beta, 2)
         metrics['stock_beta_std'] = round(std_beta, 2)
@@ -223,8 +556,8 @@ def detect_behavioral_anomaly(
             metrics['stock_beta_z_score'] = round(z_score_beta, 2)
             
             if abs(z_score_beta) > 2:
-                direction = "higher" if z_score_beta > 0 else "lower"
-                risk_level = "riskier" if z_score_beta > 0 else "less risky"
+                direction = _BETA_DIRECTION[int(z_score_beta > 0)]
+                risk_level = _BETA_RISK[int(z_score_beta > 0)]
                 anomalies.append({
                     'type': 'stock_beta',
                     'message': f"Stock beta is {abs(z_score_beta):.2f} standard deviations {direction} than usual ({risk_level})",
@@ -236,14 +569,14 @@ def detect_behavioral_anomaly(
         warnings.append('Insufficient trade history for stock beta analysis (need at least 2 trades)')
     
     # Check for new sector exposure
-    if sectors:
+    if stats.sectors:
         current_sector = current_trade.get('sector')
-        if current_sector and current_sector not in sectors:
+        if current_sector and current_sector not in stats.sectors:
             warnings.append({
                 'type': 'new_sector',
                 'message': f"New Sector Warning: '{current_sector}' is not in your trading history",
                 'current_sector': current_sector,
-                'known_sectors': list(set(sectors))
+                'known_sectors': list(stats.sectors)
             })
     
     return {
@@ -265,34 +598,37 @@ def format_behavioral_analysis(analysis: Dict, current_trade: Dict) -> str:
     Returns:
         Formatted string report
     """
-    report = []
-    report.append("=" * 60)
-    report.append("BEHAVIORAL ANOMALY DETECTION")
-    report.append("=" * 60)
-    
-    report.append(f"\nCurrent Trade:")
-    report.append(f"  Position Size: ${current_trade.get('position_size', 'N/A'):,.2f}")
-    report.append(f"  Stock Beta: {current_trade.get('stock_beta', 'N/A')}")
-    report.append(f"  Sector: {current_trade.get('sector', 'N/A')}")
-    
-    if analysis['metrics']:
-        report.append(f"\nHistorical Averages:")
-        if 'position_size_mean' in analysis['metrics']:
-            report.append(f"  Mean Position Size: ${analysis['metrics']['position_size_mean']:,.2f}")
-        if 'stock_beta_mean' in analysis['metrics']:
-            report.append(f"  Mean Stock Beta: {analysis['metrics']['stock_beta_mean']:.2f}")
+    report = [
+        _HR,
+        "BEHAVIORAL ANOMALY DETECTION",
+        _HR,
+        "\nCurrent Trade:",
+        f"  Position Size: ${current_trade.get('position_size', 'N/A'):,.2f}",
+        f"  Stock Beta: {current_trade.get('stock_beta', 'N/A')}",
+        f"  Sector: {current_trade.get('sector', 'N/A')}"
+    ]
+    
+    metrics = analysis['metrics']
+    if metrics:
+        report.append("\nHistorical Averages:")
+        if 'position_size_mean' in metrics:
+            report.append(f"  Mean Position Size: ${metrics['position_size_mean']:,.2f}")
+        if 'stock_beta_mean' in metrics:
+            report.append(f"  Mean Stock Beta: {metrics['stock_beta_mean']:.2f}")
     
     if analysis['is_anomaly']:
         report.append(f"\n⚠️  ANOMALIES DETECTED: {len(analysis['anomalies'])}")
         for i, anomaly in enumerate(analysis['anomalies'], 1):
-            report.append(f"\n  {i}. {anomaly['message']}")
-            report.append(f"     Current: {anomaly['current_value']}")
-            report.append(f"     Historical Mean: {anomaly['historical_mean']}")
+            report.extend((
+                f"\n  {i}. {anomaly['message']}",
+                f"     Current: {anomaly['current_value']}",
+                f"     Historical Mean: {anomaly['historical_mean']}"
+            ))
     else:
-        report.append(f"\n✓ No anomalies detected - trade is within normal parameters")
+        report.append("\n✓ No anomalies detected - trade is within normal parameters")
     
     if analysis['warnings']:
-        report.append(f"\nWarnings:")
+        report.append("\nWarnings:")
         for warning in analysis['warnings']:
             if isinstance(warning, dict):
                 report.append(f"  • {warning['message']}")
@@ -301,7 +637,7 @@ def format_behavioral_analysis(analysis: Dict, current_trade: Dict) -> str:
             else:
                 report.append(f"  • {warning}")
     
-    report.append("\n" + "=" * 60)
+    report.append(_HR_FOOTER)
     
     return "\n".join(report)
 
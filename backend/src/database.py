@@ -2,39 +2,264 @@
 
 import sqlite3
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, Union
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from contextlib import contextmanager
 import os
+import threading
+from bisect import bisect_left, bisect_right
+import numpy as np
 
 
 # Default database path
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'trading_coach.db')
 
+# Maximum number of rows handed to a single executemany call in bulk inserts
+ROWS_PER_INSERT = 10000
+
+# Bulk inserts of at least this many rows (and at least as many as the table
+# already holds) drop the secondary trade indexes and rebuild them afterwards
+INDEX_REBUILD_MIN_ROWS = 1000
+
+# Journal mode set once by init_database; it persists in the database file.
+# WAL gives single-fsync commits and readers that don't block the writer.
+_JOURNAL_MODE_PRAGMA = "PRAGMA journal_mode=WAL"
+
+# Settings applied to every new connection. They only set per-connection
+# state (no file I/O), so they stay cheap even where connections are opened
+# often, e.g. one per Streamlit rerun thread. With WAL, synchronous=NORMAL
+# stays consistent and only risks the last commit on power loss.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456"
+)
+
+# Shared encoder for analysis results; compact separators keep the stored
+# JSON small, and reusing one encoder avoids rebuilding it per json.dumps call
+_encode_result = json.JSONEncoder(separators=(',', ':')).encode
+
+
+# Column order of the trade rows returned by the SELECT statements below
+_TRADE_COLUMNS = (
+    'id', 'symbol', 'entry_price', 'entry_date', 'horizon',
+    'position_size', 'stock_beta', 'sector', 'created_at'
+)
+
+# Statements used on every call, kept as shared constants so each one is
+# compiled once per connection and then served from sqlite3's statement cache
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades (symbol, entry_price, entry_date, horizon,
+                      position_size, stock_beta, sector)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Secondary indexes on trades, and the statements that drop them for bulk loads
+_CREATE_TRADE_INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_entry_date ON trades(entry_date)"
+)
+
+_DROP_TRADE_INDEXES_SQL = (
+    "DROP INDEX IF EXISTS idx_trades_symbol",
+    "DROP INDEX IF EXISTS idx_trades_entry_date"
+)
+
+# Version of the schema below, recorded in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Full schema for init_database; every statement is idempotent, and the
+# script runs as a single transaction
+_SCHEMA_SQL = f"""
+    BEGIN;
+    
+    CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        entry_price REAL NOT NULL,
+        entry_date TEXT NOT NULL,
+        horizon INTEGER NOT NULL,
+        position_size REAL,
+        stock_beta REAL,
+        sector TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    CREATE TABLE IF NOT EXISTS analysis_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trade_id INTEGER NOT NULL,
+        analysis_type TEXT NOT NULL,
+        result_data TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (trade_id) REFERENCES trades(id)
+    );
+    
+    {_CREATE_TRADE_INDEXES_SQL[0]};
+    {_CREATE_TRADE_INDEXES_SQL[1]};
+    CREATE INDEX IF NOT EXISTS idx_analysis_trade_id ON analysis_results(trade_id);
+    CREATE INDEX IF NOT EXISTS idx_analysis_type ON analysis_results(analysis_type);
+    
+    PRAGMA user_version = {SCHEMA_VERSION};
+    
+    COMMIT;
+"""
+
+_INSERT_ANALYSIS_SQL = """
+    INSERT INTO analysis_results (trade_id, analysis_type, result_data)
+    VALUES (?, ?, ?)
+"""
+
+_SELECT_LAST_TRADES_SQL = """
+    SELECT id, symbol, entry_price, entry_date, horizon,
+           position_size, stock_beta, sector, created_at
+    FROM trades
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+_SELECT_TRADE_BY_ID_SQL = """
+    SELECT id, symbol, entry_price, entry_date, horizon,
+           position_size, stock_beta, sector, created_at
+    FROM trades
+    WHERE id = ?
+"""
+
+_SELECT_ANALYSES_SQL = """
+    SELECT id, analysis_type, result_data, created_at
+    FROM analysis_results
+    WHERE trade_id = ?
+    ORDER BY id DESC
+"""
+
+# All of get_database_stats' counts and ranges in one statement
+_SELECT_STATS_SQL = """
+    SELECT (SELECT COUNT(*) FROM trades),
+           (SELECT COUNT(*) FROM analysis_results),
+           (SELECT MIN(entry_date) FROM trades),
+           (SELECT MAX(entry_date) FROM trades),
+           (SELECT COUNT(DISTINCT symbol) FROM trades),
+           (SELECT COUNT(DISTINCT sector) FROM trades WHERE sector IS NOT NULL)
+"""
+
+_SELECT_BEHAVIORAL_SQL = """
+    SELECT position_size, stock_beta, sector
+    FROM trades
+    WHERE position_size IS NOT NULL
+      AND stock_beta IS NOT NULL
+      AND sector IS NOT NULL
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+_SELECT_BEHAVIORAL_EXCLUDING_SQL = """
+    SELECT position_size, stock_beta, sector
+    FROM trades
+    WHERE id NOT IN (SELECT value FROM json_each(?))
+      AND position_size IS NOT NULL
+      AND stock_beta IS NOT NULL
+      AND sector IS NOT NULL
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+# id comes last so the rows still fit _behavioral_columns
+_SELECT_BEHAVIORAL_ID_RANGE_SQL = """
+    SELECT position_size, stock_beta, sector, id
+    FROM trades
+    WHERE id BETWEEN ? AND ?
+      AND position_size IS NOT NULL
+      AND stock_beta IS NOT NULL
+      AND sector IS NOT NULL
+    ORDER BY id
+"""
+
+
+# Open connections, reused across calls; one per database path in each thread
+# (sqlite3 connections must stay on the thread that created them). Reuse only
+# pays off on long-lived threads such as a CLI run; Streamlit starts each rerun
+# on a new thread, which opens (and configures) a fresh connection
+_local = threading.local()
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """Open and configure a new connection to the database at db_path."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row  # Enable column access by name
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _thread_connection(db_path: str) -> sqlite3.Connection:
+    """Return the current thread's connection to db_path, opening it on first use."""
+    connections = _local.__dict__.setdefault('connections', {})
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = _open_connection(db_path)
+    return conn
+
 
 @contextmanager
 def get_db_connection(db_path: str = DB_PATH):
     """
     Context manager for database connections.
     
+    The connection for db_path is opened on first use and then kept open for
+    the rest of the thread, so later calls reuse it (and its page cache)
+    instead of reconnecting. Connections run in autocommit mode
+    (isolation_level=None): single statements commit on their own and
+    multi-statement writes open their transaction explicitly with BEGIN.
+    Whatever transaction is still open on exit is committed, or rolled back
+    on error. Read-only queries use get_read_connection instead.
+    
     Args:
         db_path: Path to the SQLite database file
         
     Yields:
         sqlite3.Connection: Database connection
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
+    conn = _thread_connection(db_path)
     try:
         yield conn
         conn.commit()
     except Exception as e:
         conn.rollback()
         raise e
-    finally:
+
+
+@contextmanager
+def get_read_connection(db_path: str = DB_PATH):
+    """
+    Context manager for read-only database access.
+    
+    Yields the same per-thread connection as get_db_connection, but leaves
+    transaction control alone: SELECTs run in autocommit mode, so there is
+    nothing to commit or roll back on exit.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Yields:
+        sqlite3.Connection: Database connection
+    """
+    yield _thread_connection(db_path)
+
+
+def close_db_connections():
+    """Close the current thread's open database connections; call when the thread is done with the database."""
+    connections = _local.__dict__.pop('connections', {})
+    for conn in connections.values():
         conn.close()
 
 
+def _fetch_tuples(conn: sqlite3.Connection, sql: str, params: tuple) -> List[tuple]:
+    """Run a query and return plain tuples instead of sqlite3.Row objects."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params).fetchall()
+
+
 def init_database(db_path: str = DB_PATH):
     """
     Initialize the database with required tables.
@@ -43,64 +268,17 @@ def init_database(db_path: str = DB_PATH):
         db_path: Path to the SQLite database file
     """
     with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Create trades table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                entry_price REAL NOT NULL,
-                entry_date TEXT NOT NULL,
-                horizon INTEGER NOT NULL,
-                position_size REAL,
-                stock_beta REAL,
-                sector TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Create analysis_results table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analysis_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                trade_id INTEGER NOT NULL,
-                analysis_type TEXT NOT NULL,
-                result_data TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (trade_id) REFERENCES trades(id)
-            )
-        """)
-        
-        # Create indexes for better query performance
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_symbol 
-            ON trades(symbol)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trades_entry_date 
-            ON trades(entry_date)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_analysis_trade_id 
-            ON analysis_results(trade_id)
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_analysis_type 
-            ON analysis_results(analysis_type)
-        """)
-        
-        conn.commit()
+        # Switch the file to WAL once (it can't change inside a transaction)
+        conn.execute(_JOURNAL_MODE_PRAGMA)
+        # Create every table and index in one transaction and one script call
+        conn.executescript(_SCHEMA_SQL)
         print(f"Database initialized at: {db_path}")
 
 
 def save_trade(
     symbol: str,
     entry_price: float,
-    entry_date: Union[str, datetime],
+    entry_date: Union[str, date, datetime],
     horizon: int,
     position_size: Optional[float] = None,
     stock_beta: Optional[float] = None,
@@ -110,10 +288,13 @@ def save_trade(
     """
     Save a new trade to the database.
     
+    To save many trades, use save_trades_bulk instead: it inserts them with
+    executemany in a single transaction rather than one commit per trade.
+    
     Args:
         symbol: Stock symbol (e.g., 'AAPL')
         entry_price: Entry price of the trade
-        entry_date: Date of trade entry (string or datetime)
+        entry_date: Date of trade entry (string, date or datetime)
         horizon: Number of days for analysis horizon
         position_size: Size of the position (optional)
         stock_beta: Beta of the stock (optional)
@@ -128,23 +309,91 @@ def save_trade(
         ...                       position_size=10000, stock_beta=1.2, sector='Technology')
         >>> print(f"Trade saved with ID: {trade_id}")
     """
-    # Convert datetime to string if needed
-    if isinstance(entry_date, datetime):
-        entry_date = entry_date.strftime('%Y-%m-%d')
+    # Convert date/datetime to a YYYY-MM-DD string if needed
+    if isinstance(entry_date, date):
+        entry_date = entry_date.isoformat()[:10]
     
     with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO trades (symbol, entry_price, entry_date, horizon, 
-                              position_size, stock_beta, sector)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (symbol, entry_price, entry_date, horizon, position_size, stock_beta, sector))
+        trade_id = conn.execute(
+            _INSERT_TRADE_SQL,
+            (symbol, entry_price, entry_date, horizon, position_size, stock_beta, sector)
+        ).lastrowid
         
-        trade_id = cursor.lastrowid
+    return trade_id
+
+
+def save_trades_bulk(
+    trades: List[Dict],
+    db_path: str = DB_PATH
+) -> List[int]:
+    """
+    Save many trades to the database in a single transaction.
+    
+    Rows are inserted with executemany in chunks of ROWS_PER_INSERT, and the
+    whole batch is committed once, so callers avoid paying a connection and
+    commit per trade. Large batches (see INDEX_REBUILD_MIN_ROWS) are loaded
+    without the secondary indexes, which are rebuilt once at the end of the
+    transaction and then re-analyzed.
+    
+    Args:
+        trades: List of dictionaries with the same keys as save_trade's arguments
+        db_path: Path to the SQLite database file
+    
+    Returns:
+        List of IDs of the newly created trades, in input order
+    
+    Example:
+        >>> trade_ids = save_trades_bulk([
+        ...     {'symbol': 'AAPL', 'entry_price': 150.00, 'entry_date': '2025-12-01', 'horizon': 30},
+        ...     {'symbol': 'MSFT', 'entry_price': 380.00, 'entry_date': '2025-12-02', 'horizon': 30},
+        ... ])
+    """
+    if not trades:
+        return []
+    
+    rows = []
+    for trade in trades:
+        entry_date = trade['entry_date']
+        if isinstance(entry_date, date):
+            entry_date = entry_date.isoformat()[:10]
+        rows.append((
+            trade['symbol'],
+            trade['entry_price'],
+            entry_date,
+            trade['horizon'],
+            trade.get('position_size'),
+            trade.get('stock_beta'),
+            trade.get('sector')
+        ))
+    
+    with get_db_connection(db_path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        
+        # Building an index once is cheaper than updating it row by row, but
+        # only pays off when the batch is large relative to the existing table
+        existing_rows = conn.execute("SELECT MAX(id) FROM trades").fetchone()[0] or 0
+        rebuild_indexes = len(rows) >= max(INDEX_REBUILD_MIN_ROWS, existing_rows)
+        if rebuild_indexes:
+            for drop_index_sql in _DROP_TRADE_INDEXES_SQL:
+                conn.execute(drop_index_sql)
+        
+        for start in range(0, len(rows), ROWS_PER_INSERT):
+            conn.executemany(_INSERT_TRADE_SQL, rows[start:start + ROWS_PER_INSERT])
+        
+        # executemany does not set cursor.lastrowid; IDs within one
+        # transaction are contiguous, so derive them from the last one
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        
+        if rebuild_indexes:
+            for create_index_sql in _CREATE_TRADE_INDEXES_SQL:
+                conn.execute(create_index_sql)
         conn.commit()
         
-    return trade_id
+        # Refresh the planner's statistics for the rebuilt indexes
+        if rebuild_indexes:
+            conn.execute("ANALYZE trades")
+    
+    return list(range(last_id - len(rows) + 1, last_id + 1))
 
 
 def save_analysis_result(
@@ -167,21 +416,15 @@ def save_analysis_result(
         
     Example:
         >>> timing_result = analyze_trade_timing(150.00, '2025-12-01', df)
-        >>> result_id = save_analysis_result(trade_id, 'timing', timing_result)
+        >>> result_id = save_analysis_result(trade_id, 'timing', timing_result.as_dict())
     """
+    # Convert dict to compact JSON string
+    result_json = _encode_result(result_data)
+    
     with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Convert dict to JSON string
-        result_json = json.dumps(result_data)
-        
-        cursor.execute("""
-            INSERT INTO analysis_results (trade_id, analysis_type, result_data)
-            VALUES (?, ?, ?)
-        """, (trade_id, analysis_type, result_json))
-        
-        result_id = cursor.lastrowid
-        conn.commit()
+        result_id = conn.execute(
+            _INSERT_ANALYSIS_SQL, (trade_id, analysis_type, result_json)
+        ).lastrowid
         
     return result_id
 
@@ -201,35 +444,11 @@ def get_last_n_trades(n: int = 50, db_path: str = DB_PATH) -> List[Dict]:
         >>> recent_trades = get_last_n_trades(50)
         >>> print(f"Retrieved {len(recent_trades)} trades")
     """
-    with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, symbol, entry_price, entry_date, horizon,
-                   position_size, stock_beta, sector, created_at
-            FROM trades
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (n,))
-        
-        rows = cursor.fetchall()
+    with get_read_connection(db_path) as conn:
+        rows = _fetch_tuples(conn, _SELECT_LAST_TRADES_SQL, (n,))
         
     # Convert to list of dictionaries
-    trades = []
-    for row in rows:
-        trades.append({
-            'id': row['id'],
-            'symbol': row['symbol'],
-            'entry_price': row['entry_price'],
-            'entry_date': row['entry_date'],
-            'horizon': row['horizon'],
-            'position_size': row['position_size'],
-            'stock_beta': row['stock_beta'],
-            'sector': row['sector'],
-            'created_at': row['created_at']
-        })
-    
-    return trades
+    return [dict(zip(_TRADE_COLUMNS, row)) for row in rows]
 
 
 def get_trade_by_id(trade_id: int, db_path: str = DB_PATH) -> Optional[Dict]:
@@ -243,32 +462,13 @@ def get_trade_by_id(trade_id: int, db_path: str = DB_PATH) -> Optional[Dict]:
     Returns:
         Dictionary containing trade data or None if not found
     """
-    with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, symbol, entry_price, entry_date, horizon,
-                   position_size, stock_beta, sector, created_at
-            FROM trades
-            WHERE id = ?
-        """, (trade_id,))
+    with get_read_connection(db_path) as conn:
+        rows = _fetch_tuples(conn, _SELECT_TRADE_BY_ID_SQL, (trade_id,))
         
-        row = cursor.fetchone()
-        
-    if row is None:
+    if not rows:
         return None
     
-    return {
-        'id': row['id'],
-        'symbol': row['symbol'],
-        'entry_price': row['entry_price'],
-        'entry_date': row['entry_date'],
-        'horizon': row['horizon'],
-        'position_size': row['position_size'],
-        'stock_beta': row['stock_beta'],
-        'sector': row['sector'],
-        'created_at': row['created_at']
-    }
+    return dict(zip(_TRADE_COLUMNS, rows[0]))
 
 
 def get_analysis_results(trade_id: int, db_path: str = DB_PATH) -> List[Dict]:
@@ -282,33 +482,54 @@ def get_analysis_results(trade_id: int, db_path: str = DB_PATH) -> List[Dict]:
     Returns:
         List of dictionaries containing analysis results
     """
-    with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, analysis_type, result_data, created_at
-            FROM analysis_results
-            WHERE trade_id = ?
-            ORDER BY created_at DESC
-        """, (trade_id,))
-        
-        rows = cursor.fetchall()
-        
-    results = []
-    for row in rows:
-        results.append({
-            'id': row['id'],
-            'analysis_type': row['analysis_type'],
-            'result_data': json.loads(row['result_data']),
-            'created_at': row['created_at']
-        })
+    with get_read_connection(db_path) as conn:
+        rows = _fetch_tuples(conn, _SELECT_ANALYSES_SQL, (trade_id,))
+        
+    return [
+        {
+            'id': result_id,
+            'analysis_type': analysis_type,
+            'result_data': json.loads(result_data),
+            'created_at': created_at
+        }
+        for result_id, analysis_type, result_data, created_at in rows
+    ]
+
+
+def _fetch_behavioral_rows(
+    n: int,
+    exclude_trade_ids: Union[int, Iterable[int], None],
+    db_path: str
+) -> List[tuple]:
+    """Fetch (position_size, stock_beta, sector) tuples for behavioral analysis."""
+    if exclude_trade_ids is None:
+        excluded = []
+    elif isinstance(exclude_trade_ids, (int, np.integer)):
+        excluded = [int(exclude_trade_ids)] if exclude_trade_ids else []
+    else:
+        excluded = [int(trade_id) for trade_id in exclude_trade_ids]
     
-    return results
+    with get_read_connection(db_path) as conn:
+        if excluded:
+            # The whole exclusion set travels as one JSON array parameter
+            return _fetch_tuples(
+                conn, _SELECT_BEHAVIORAL_EXCLUDING_SQL, (json.dumps(excluded), n)
+            )
+        return _fetch_tuples(conn, _SELECT_BEHAVIORAL_SQL, (n,))
+
+
+def _behavioral_columns(rows: List[tuple]) -> Dict[str, np.ndarray]:
+    """Turn (position_size, stock_beta, sector) rows into column arrays."""
+    return {
+        'position_size': np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows)),
+        'stock_beta': np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)),
+        'sector': np.array([row[2] for row in rows], dtype=str)
+    }
 
 
 def get_trades_for_behavioral_analysis(
     n: int = 50,
-    exclude_trade_id: Optional[int] = None,
+    exclude_trade_ids: Union[int, Iterable[int], None] = None,
     db_path: str = DB_PATH
 ) -> List[Dict]:
     """
@@ -319,48 +540,105 @@ def get_trades_for_behavioral_analysis(
     
     Args:
         n: Number of trades to retrieve (default: 50)
-        exclude_trade_id: Optional trade ID to exclude (typically the current trade)
+        exclude_trade_ids: Optional trade ID, or collection of trade IDs, to
+                           exclude (typically the current trade)
         db_path: Path to the SQLite database file
         
     Returns:
         List of dictionaries ready for behavioral analysis
     """
-    with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
+    rows = _fetch_behavioral_rows(n, exclude_trade_ids, db_path)
+    
+    return [
+        {
+            'position_size': position_size,
+            'stock_beta': stock_beta,
+            'sector': sector
+        }
+        for position_size, stock_beta, sector in rows
+    ]
+
+
+def get_trades_for_behavioral_analysis_soa(
+    n: int = 50,
+    exclude_trade_ids: Union[int, Iterable[int], None] = None,
+    db_path: str = DB_PATH
+) -> Dict[str, np.ndarray]:
+    """
+    Get recent trades for behavioral analysis as column arrays.
+    
+    Same selection as get_trades_for_behavioral_analysis, but returns one
+    NumPy array per field instead of one dictionary per trade, so
+    detect_behavioral_anomaly can compute its statistics directly on
+    contiguous columns.
+    
+    Args:
+        n: Number of trades to retrieve (default: 50)
+        exclude_trade_ids: Optional trade ID, or collection of trade IDs, to
+                           exclude (typically the current trade)
+        db_path: Path to the SQLite database file
         
-        if exclude_trade_id:
-            cursor.execute("""
-                SELECT position_size, stock_beta, sector
-                FROM trades
-                WHERE id != ? 
-                  AND position_size IS NOT NULL 
-                  AND stock_beta IS NOT NULL 
-                  AND sector IS NOT NULL
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (exclude_trade_id, n))
-        else:
-            cursor.execute("""
-                SELECT position_size, stock_beta, sector
-                FROM trades
-                WHERE position_size IS NOT NULL 
-                  AND stock_beta IS NOT NULL 
-                  AND sector IS NOT NULL
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (n,))
+    Returns:
+        Dictionary with 'position_size' and 'stock_beta' float arrays and a
+        'sector' string array, all of the same length
+    """
+    return _behavioral_columns(_fetch_behavioral_rows(n, exclude_trade_ids, db_path))
+
+
+def get_trades_in_id_range(
+    start_id: int,
+    end_id: int,
+    db_path: str = DB_PATH
+) -> Dict[str, np.ndarray]:
+    """
+    Get the trades with IDs from start_id to end_id for behavioral analysis.
+    
+    The ID range and the NULL checks are applied in SQL (a primary key range
+    scan), so only the matching rows are read back.
+    
+    Args:
+        start_id: First trade ID of the range (inclusive)
+        end_id: Last trade ID of the range (inclusive)
+        db_path: Path to the SQLite database file
         
-        rows = cursor.fetchall()
+    Returns:
+        Dictionary of column arrays in ID order, in the same format as
+        get_trades_for_behavioral_analysis_soa
+    """
+    return get_trades_in_id_ranges([(start_id, end_id)], db_path)[0]
+
+
+def get_trades_in_id_ranges(
+    id_ranges: List[Tuple[int, int]],
+    db_path: str = DB_PATH
+) -> List[Dict[str, np.ndarray]]:
+    """
+    Get the trades of several ID ranges for behavioral analysis in one query.
+    
+    A single primary key range scan covers all of the ranges; each range's
+    rows are then sliced out of the ID-ordered result.
+    
+    Args:
+        id_ranges: (start_id, end_id) pairs, both ends inclusive
+        db_path: Path to the SQLite database file
         
-    trade_history = []
-    for row in rows:
-        trade_history.append({
-            'position_size': row['position_size'],
-            'stock_beta': row['stock_beta'],
-            'sector': row['sector']
-        })
+    Returns:
+        One dictionary of column arrays per range, in the order of id_ranges
+        and in the same format as get_trades_in_id_range
+    """
+    if not id_ranges:
+        return []
     
-    return trade_history
+    first_id = min(start_id for start_id, _ in id_ranges)
+    last_id = max(end_id for _, end_id in id_ranges)
+    with get_read_connection(db_path) as conn:
+        rows = _fetch_tuples(conn, _SELECT_BEHAVIORAL_ID_RANGE_SQL, (first_id, last_id))
+    
+    ids = [row[3] for row in rows]
+    return [
+        _behavioral_columns(rows[bisect_left(ids, start_id):bisect_right(ids, end_id)])
+        for start_id, end_id in id_ranges
+    ]
 
 
 def get_database_stats(db_path: str = DB_PATH) -> Dict:
@@ -373,41 +651,17 @@ def get_database_stats(db_path: str = DB_PATH) -> Dict:
     Returns:
         Dictionary containing database statistics
     """
-    with get_db_connection(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Count total trades
-        cursor.execute("SELECT COUNT(*) as count FROM trades")
-        total_trades = cursor.fetchone()['count']
-        
-        # Count total analyses
-        cursor.execute("SELECT COUNT(*) as count FROM analysis_results")
-        total_analyses = cursor.fetchone()['count']
-        
-        # Get date range
-        cursor.execute("""
-            SELECT MIN(entry_date) as first_trade, MAX(entry_date) as last_trade
-            FROM trades
-        """)
-        date_range = cursor.fetchone()
-        
-        # Get unique symbols
-        cursor.execute("SELECT COUNT(DISTINCT symbol) as count FROM trades")
-        unique_symbols = cursor.fetchone()['count']
-        
-        # Get unique sectors
-        cursor.execute("""
-            SELECT COUNT(DISTINCT sector) as count 
-            FROM trades 
-            WHERE sector IS NOT NULL
-        """)
-        unique_sectors = cursor.fetchone()['count']
-        
+    with get_read_connection(db_path) as conn:
+        row = _fetch_tuples(conn, _SELECT_STATS_SQL, ())[0]
+    
+    (total_trades, total_analyses, first_trade, last_trade,
+     unique_symbols, unique_sectors) = row
+    
     return {
         'total_trades': total_trades,
         'total_analyses': total_analyses,
-        'first_trade_date': date_range['first_trade'],
-        'last_trade_date': date_range['last_trade'],
+        'first_trade_date': first_trade,
+        'last_trade_date': last_trade,
         'unique_symbols': unique_symbols,
         'unique_sectors': unique_sectors,
         'database_path': db_path
@@ -435,10 +689,8 @@ if __name__ == "__main__":
          'horizon': 30, 'position_size': 10500, 'stock_beta': 1.3, 'sector': 'Finance'},
     ]
     
-    trade_ids = []
-    for trade in sample_trades:
-        trade_id = save_trade(**trade)
-        trade_ids.append(trade_id)
+    trade_ids = save_trades_bulk(sample_trades)
+    for trade, trade_id in zip(sample_trades, trade_ids):
         print(f"  Saved {trade['symbol']} with ID: {trade_id}")
     
     # Example: Save an analysis result
@@ -1,14 +1,20 @@
 """Mock data generator for testing Trading Coach without Tiger API"""
 
+import zlib
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 
 def generate_mock_historical_data(symbol: str, horizon_days: int, base_price: float = 150.0) -> pd.DataFrame:
     """
     Generate realistic mock historical stock data for testing.
     
+    Results are deterministic per (symbol, horizon_days, base_price) on a given
+    day, so they are cached for that day; each call returns a fresh copy that
+    callers may modify.
+    
     Args:
         symbol: Stock symbol (not used, for compatibility)
         horizon_days: Number of days of data to generate
@@ -17,50 +23,54 @@ def generate_mock_historical_data(symbol: str, horizon_days: int, base_price: fl
     Returns:
         pandas.DataFrame with columns: date, open, high, low, close, volume
     """
-    np.random.seed(hash(symbol) % 2**32)  # Consistent data per symbol
+    # Dates end today, so today's date is part of the cache key; a long-running
+    # process never gets an earlier day's frame
+    return _generate_mock_historical_data(symbol, horizon_days, base_price, date.today()).copy()
+
+
+@lru_cache(maxsize=128)
+def _generate_mock_historical_data(
+    symbol: str,
+    horizon_days: int,
+    base_price: float,
+    as_of: date
+) -> pd.DataFrame:
+    """Build the mock frame for generate_mock_historical_data (cached, do not mutate)."""
+    # Seed from a stable checksum so data is consistent per symbol across runs
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
     
-    dates = []
-    data = []
+    # Calendar days of the horizon, skipping weekends
+    dates = pd.date_range(datetime.now() - timedelta(days=horizon_days), periods=horizon_days, freq='D')
+    dates = dates[dates.weekday < 5]  # Drop Saturday and Sunday
+    n = len(dates)
     
-    current_price = base_price
-    current_date = datetime.now() - timedelta(days=horizon_days)
+    # Generate realistic price movements as one compounded path
+    daily_returns = rng.normal(0.001, 0.02, n)  # 0.1% mean return, 2% volatility
+    prices = base_price * np.cumprod(1 + daily_returns)
     
-    for i in range(horizon_days):
-        # Skip weekends
-        if current_date.weekday() >= 5:  # Saturday or Sunday
-            current_date += timedelta(days=1)
-            continue
-        
-        # Generate realistic price movements
-        daily_return = np.random.normal(0.001, 0.02)  # 0.1% mean return, 2% volatility
-        current_price = current_price * (1 + daily_return)
-        
-        # Generate OHLC data
-        daily_volatility = current_price * 0.015  # 1.5% intraday range
-        
-        open_price = current_price + np.random.normal(0, daily_volatility * 0.5)
-        close_price = current_price + np.random.normal(0, daily_volatility * 0.5)
-        
-        high_price = max(open_price, close_price) + abs(np.random.normal(0, daily_volatility * 0.3))
-        low_price = min(open_price, close_price) - abs(np.random.normal(0, daily_volatility * 0.3))
-        
-        # Generate volume
-        base_volume = 50_000_000
-        volume = int(base_volume * np.random.uniform(0.7, 1.3))
-        
-        data.append({
-            'date': current_date,
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'volume': volume
-        })
-        
-        current_date += timedelta(days=1)
+    # Generate OHLC data
+    daily_volatility = prices * 0.015  # 1.5% intraday range
+    
+    open_prices = prices + rng.normal(0, daily_volatility * 0.5)
+    close_prices = prices + rng.normal(0, daily_volatility * 0.5)
+    
+    high_prices = np.maximum(open_prices, close_prices) + np.abs(rng.normal(0, daily_volatility * 0.3))
+    low_prices = np.minimum(open_prices, close_prices) - np.abs(rng.normal(0, daily_volatility * 0.3))
+    
+    # Generate volume
+    base_volume = 50_000_000
+    volumes = (base_volume * rng.uniform(0.7, 1.3, n)).astype(np.int64)
+    
+    # Round the OHLC columns straight into one preallocated block; column-major
+    # order matches pandas' internal layout, so the frame wraps it without a copy
+    ohlc = np.empty((n, 4), order='F')
+    for column, values in enumerate((open_prices, high_prices, low_prices, close_prices)):
+        np.round(values, 2, out=ohlc[:, column])
     
-    df = pd.DataFrame(data)
-    return df.sort_values('date').reset_index(drop=True)
+    df = pd.DataFrame(ohlc, columns=['open', 'high', 'low', 'close'], copy=False)
+    df.insert(0, 'date', dates)
+    df['volume'] = volumes
+    return df
 
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
 """Tiger Brokers API Client for Trading Coach POC"""
 
+import glob
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from tigeropen.common.consts import Language, Market
@@ -12,6 +17,25 @@ from tigeropen.tiger_open_config import TigerOpenClientConfig
 # Load environment variables
 load_dotenv()
 
+# How long fetched bars are reused for repeated requests of the same symbol
+_BARS_TTL_SECONDS = 60.0
+
+# Most (symbol, horizon_days) pairs kept in memory at once
+_BARS_CACHE_MAX_ENTRIES = 32
+
+# (symbol, horizon_days) -> (fetch time, bars frame), oldest fetch first; entries are never mutated
+_bars_cache: Dict[Tuple[str, int], Tuple[float, pd.DataFrame]] = {}
+
+# On-disk cache of fetched bars, shared across processes (CLI runs, app restarts).
+# Stored as CSV rather than pickle, so a file in this directory is only ever parsed as data
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'ohlcv')
+
+# How long a cached bars file is reused; today's bar keeps changing during the session
+_DISK_CACHE_TTL_SECONDS = 3600.0
+
+# Fields read from each bar object when get_bars returns a list
+_BAR_FIELDS = attrgetter('time', 'open', 'high', 'low', 'close', 'volume')
+
 
 class TigerClientManager:
     """Manager class for Tiger Brokers QuoteClient"""
@@ -98,28 +122,82 @@ class TigerClientManager:
             if not bars or len(bars) == 0:
                 return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
             
-            # Convert to DataFrame
-            data_list = []
-            for bar in bars:
-                data_list.append({
-                    'date': datetime.fromtimestamp(bar.time / 1000),
-                    'open': bar.open,
-                    'high': bar.high,
-                    'low': bar.low,
-                    'close': bar.close,
-                    'volume': bar.volume
-                })
-            df = pd.DataFrame(data_list)
+            # Transpose the bar objects into columns and convert all timestamps at once
+            times, opens, highs, lows, closes, volumes = zip(*map(_BAR_FIELDS, bars))
+            df = pd.DataFrame({
+                'date': pd.to_datetime(np.asarray(times, dtype=np.int64), unit='ms'),
+                'open': opens,
+                'high': highs,
+                'low': lows,
+                'close': closes,
+                'volume': volumes
+            })
         
         df = df.sort_values('date').reset_index(drop=True)
         
         return df
 
 
+@lru_cache(maxsize=2)
+def _get_client(sandbox: bool = False) -> TigerClientManager:
+    """Return the shared TigerClientManager, created (and configured) on first use."""
+    return TigerClientManager(sandbox=sandbox)
+
+
+def _bars_file_prefix(symbol: str, horizon_days: int) -> str:
+    """Path prefix shared by every day's cached bars file for symbol and horizon."""
+    safe_symbol = symbol.replace(os.sep, '_')
+    return os.path.join(CACHE_DIR, f"{safe_symbol}_{horizon_days}_")
+
+
+def _read_cached_bars(path: str) -> Optional[pd.DataFrame]:
+    """Return the bars stored at path if the file is recent enough and readable, otherwise None."""
+    try:
+        if time.time() - os.path.getmtime(path) >= _DISK_CACHE_TTL_SECONDS:
+            return None
+        df = pd.read_csv(path, parse_dates=['date'])
+    except Exception:
+        # Missing, truncated or otherwise unreadable files just mean a refetch
+        return None
+    return None if df.empty else df
+
+
+def _write_cached_bars(path: str, prefix: str, df: pd.DataFrame):
+    """Write df to path and drop earlier days' files for the same prefix (best effort)."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write under a temporary name first so readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        for old_path in glob.glob(glob.escape(prefix) + '*.csv'):
+            if old_path != path:
+                os.remove(old_path)
+    except OSError:
+        pass
+
+
+def _store_bars(key: Tuple[str, int], now: float, df: pd.DataFrame):
+    """Add df to the in-memory cache, evicting expired entries and then the oldest beyond the bound."""
+    # Entries are inserted in fetch order, so the dict's first keys are always the oldest
+    for stale_key in [k for k, (fetched, _) in _bars_cache.items() if now - fetched >= _BARS_TTL_SECONDS]:
+        del _bars_cache[stale_key]
+    while len(_bars_cache) >= _BARS_CACHE_MAX_ENTRIES:
+        del _bars_cache[next(iter(_bars_cache))]
+    _bars_cache[key] = (now, df)
+
+
 def get_historical_data(symbol: str, horizon_days: int) -> pd.DataFrame:
     """
     Helper function to fetch historical data for a symbol.
     
+    Reuses one client for all calls, and answers repeated requests for the
+    same symbol and horizon within _BARS_TTL_SECONDS from memory. Fetched
+    bars are also kept in CACHE_DIR for the day, so other processes reuse
+    them for up to _DISK_CACHE_TTL_SECONDS instead of calling the API.
+    Empty results are never written there, so a symbol without bars is
+    retried on the next call.
+    
     Args:
         symbol: Stock symbol (e.g., 'AAPL', 'TSLA')
         horizon_days: Number of days of historical data to fetch
@@ -131,8 +209,22 @@ def get_historical_data(symbol: str, horizon_days: int) -> pd.DataFrame:
         >>> df = get_historical_data('AAPL', 30)
         >>> print(df.head())
     """
-    client = TigerClientManager()
-    return client.get_historical_data(symbol, horizon_days)
+    key = (symbol, horizon_days)
+    now = time.monotonic()
+    cached = _bars_cache.get(key)
+    if cached is not None and now - cached[0] < _BARS_TTL_SECONDS:
+        return cached[1].copy()
+    
+    prefix = _bars_file_prefix(symbol, horizon_days)
+    path = f"{prefix}{date.today().isoformat()}.csv"
+    df = _read_cached_bars(path)
+    if df is None:
+        df = _get_client().get_historical_data(symbol, horizon_days)
+        if not df.empty:
+            _write_cached_bars(path, prefix, df)
+    
+    _store_bars(key, now, df)
+    return df.copy()
 
 
 if __name__ == "__main__":
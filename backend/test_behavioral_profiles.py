@@ -1,7 +1,7 @@
 """Test behavioral analysis with different investor profiles"""
 
-from src.coach_logic import detect_behavioral_anomaly, format_behavioral_analysis
-from src.database import get_last_n_trades
+from src.coach_logic import BehavioralStats, detect_behavioral_anomaly, format_behavioral_analysis
+from src.database import get_trades_in_id_ranges
 
 print("="*80)
 print("BEHAVIORAL ANALYSIS TEST - Different Investor Profiles")
@@ -73,36 +73,28 @@ test_scenarios = {
     }
 }
 
+# Load every profile's trade history in one query (ID range and NULL filtering done in SQL)
+histories = get_trades_in_id_ranges(
+    [scenario['trade_id_range'] for scenario in test_scenarios.values()]
+)
+
 # Test each profile
-for profile_name, scenario in test_scenarios.items():
+for (profile_name, scenario), trade_history in zip(test_scenarios.items(), histories):
     print(f"\n{'='*80}")
     print(f"Testing Profile: {profile_name}")
     print(f"Trade ID Range: {scenario['trade_id_range'][0]} - {scenario['trade_id_range'][1]}")
     print(f"{'='*80}")
     
-    # Get trade history for this profile
-    start_id, end_id = scenario['trade_id_range']
-    all_trades = get_last_n_trades(n=350)  # Get all trades
-    
-    # Filter trades for this profile
-    profile_trades = [t for t in all_trades if start_id <= t['id'] <= end_id]
+    num_trades = len(trade_history['sector'])
     
-    if len(profile_trades) < 2:
-        print(f"⚠️  Not enough trades found for profile (found {len(profile_trades)})")
+    if num_trades < 2:
+        print(f"⚠️  Not enough trades found for profile (found {num_trades})")
         continue
     
-    # Convert to format for behavioral analysis
-    trade_history = [
-        {
-            'position_size': t['position_size'],
-            'stock_beta': t['stock_beta'],
-            'sector': t['sector']
-        }
-        for t in profile_trades
-        if t['position_size'] and t['stock_beta'] and t['sector']
-    ]
+    print(f"✓ Loaded {num_trades} historical trades")
     
-    print(f"✓ Loaded {len(trade_history)} historical trades")
+    # Summarize the history once and reuse it for every test trade
+    history_stats = BehavioralStats.from_history(trade_history)
     
     # Test each scenario
     for i, test in enumerate(scenario['test_trades'], 1):
@@ -112,7 +104,7 @@ for profile_name, scenario in test_scenarios.items():
         print(f"{'-'*80}")
         
         # Run behavioral analysis
-        result = detect_behavioral_anomaly(test['trade'], trade_history)
+        result = detect_behavioral_anomaly(test['trade'], history_stats)
         
         # Print formatted analysis
         print(format_behavioral_analysis(result, test['trade']))
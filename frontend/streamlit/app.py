@@ -1,23 +1,218 @@
 """Trading Coach Streamlit Dashboard"""
 
+from __future__ import annotations
+
+import html
+import logging
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Add backend to Python path
 backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
 sys.path.insert(0, backend_path)
 sys.path.insert(0, os.path.join(backend_path, 'src'))
 
-from src.tiger_client import TigerClientManager
-from src.coach_logic import analyze_trade_timing, detect_behavioral_anomaly
-from src.database import init_database, save_trade, save_analysis_result, get_last_n_trades, get_trades_for_behavioral_analysis
+from src.coach_logic import analyze_trade_timing, detect_behavioral_anomaly, BehavioralStats
+from src.database import init_database, save_trade, save_analysis_result, get_last_n_trades, get_trades_for_behavioral_analysis_soa
+
+# Analysis failures are logged with their tracebacks to the Streamlit server's
+# stderr. The script runs as __main__ on every rerun, so use a named logger and
+# attach its handler only once
+log = logging.getLogger("trading_coach")
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    log.addHandler(_log_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+@st.cache_resource(show_spinner=False)
+def _init_database() -> bool:
+    """Create the schema once per Streamlit process instead of on every rerun"""
+    init_database()
+    return True
+
 
 # Initialize database
-init_database()
+_init_database()
+
+
+class _NoHistoricalData(LookupError):
+    """Raised for an empty Tiger result; st.cache_data doesn't cache exceptions"""
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_historical_data(ticker: str, horizon_days: int, as_of: date) -> pd.DataFrame:
+    """Fetch daily bars from Tiger, cached per (ticker, horizon, day) for an hour"""
+    # Imported on first use so sessions that only use mock data never load the Tiger SDK;
+    # get_historical_data reuses one client per process and its on-disk bars cache
+    from src.tiger_client import get_historical_data
+    df = get_historical_data(ticker, horizon_days)
+    # Raise rather than cache an empty frame, so a transient empty response is retried next run
+    if df.empty:
+        raise _NoHistoricalData(ticker)
+    return df
+
+
+# Read-only queries are cached briefly; saving a trade clears them, and the TTL
+# bounds staleness from writes made by other processes (e.g. the CLI)
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_recent_trades(n: int) -> list:
+    """Cached get_last_n_trades"""
+    return get_last_n_trades(n=n)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_behavioral_history() -> BehavioralStats:
+    """Cached statistics of the recent trade history"""
+    # Column arrays go straight to the compiled _moments kernel, and caching
+    # the summary means reruns skip even that
+    return BehavioralStats.from_history(get_trades_for_behavioral_analysis_soa())
+
+
+# Longer histories are merged into coarser candles so the chart payload stays bounded
+MAX_CHART_BARS = 500
+
+
+def _downsample_ohlc(df_chart: pd.DataFrame, max_bars: int = MAX_CHART_BARS) -> tuple:
+    """
+    Return the (date, open, high, low, close) column arrays of at most max_bars candles.
+    
+    Consecutive bars are merged the way a longer timeframe would be (first
+    open, highest high, lowest low, last close), so unlike plain striding no
+    price extreme is dropped from the chart.
+    """
+    columns = tuple(df_chart[column].to_numpy() for column in ('date', 'open', 'high', 'low', 'close'))
+    n = len(df_chart)
+    if n <= max_bars:
+        return columns
+    
+    dates, open_, high, low, close = columns
+    starts = np.arange(0, n, -(-n // max_bars))
+    ends = np.append(starts[1:], n) - 1
+    return (
+        dates[starts],
+        open_[starts],
+        np.fmax.reduceat(high, starts),
+        np.fmin.reduceat(low, starts),
+        close[ends]
+    )
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_price_chart(
+    df_chart: pd.DataFrame,
+    ticker: str,
+    horizon: int,
+    entry_ts: pd.Timestamp,
+    entry_price: float,
+    ideal_entry: float,
+    ideal_entry_date: pd.Timestamp,
+    mfe_price: float
+) -> go.Figure:
+    """Build the price action chart; cached on its inputs (frames are hashed by content), bounded like the data it plots"""
+    # Plotly is only needed once a trade is analyzed, so keep it off the startup path
+    # (its default "auto" JSON engine serializes figures with orjson when installed)
+    import plotly.graph_objects as go
+    
+    # Create candlestick chart
+    fig = go.Figure()
+    
+    # Add candlestick, handing Plotly the columns' NumPy arrays (views, no
+    # Series unwrapping inside the trace validators)
+    dates, open_, high, low, close = _downsample_ohlc(df_chart)
+    fig.add_trace(go.Candlestick(
+        x=dates,
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+        name='Price',
+        increasing_line_color='#26a69a',
+        decreasing_line_color='#ef5350'
+    ))
+    
+    # Add entry point marker
+    fig.add_trace(go.Scatter(
+        x=[entry_ts],
+        y=[entry_price],
+        mode='markers',
+        marker=dict(
+            symbol='diamond',
+            size=20,
+            color='gold',
+            line=dict(color='darkgoldenrod', width=2)
+        ),
+        name=f'Entry: ${entry_price:.2f}',
+        hovertemplate=f'<b>Your Entry</b><br>Price: ${entry_price:.2f}<br>Date: {entry_ts:%Y-%m-%d}<extra></extra>'
+    ))
+    
+    # Add ideal entry marker (MAE)
+    fig.add_trace(go.Scatter(
+        x=[ideal_entry_date],
+        y=[ideal_entry],
+        mode='markers',
+        marker=dict(
+            symbol='star',
+            size=18,
+            color='lime',
+            line=dict(color='darkgreen', width=2)
+        ),
+        name=f'Ideal Entry: ${ideal_entry:.2f}',
+        hovertemplate=f'<b>Ideal Entry</b><br>Price: ${ideal_entry:.2f}<br>Date: {ideal_entry_date:%Y-%m-%d}<extra></extra>'
+    ))
+    
+    # Add MFE line
+    fig.add_hline(
+        y=mfe_price,
+        line_dash="dash",
+        line_color="green",
+        annotation_text=f"MFE: ${mfe_price:.2f}",
+        annotation_position="right"
+    )
+    
+    # Update layout
+    fig.update_layout(
+        title=f"{ticker} - {horizon} Day Analysis Period",
+        yaxis_title="Price ($)",
+        yaxis_hoverformat=".2f",
+        xaxis_title="Date",
+        height=600,
+        hovermode='x unified',
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01
+        ),
+        xaxis_rangeslider_visible=False
+    )
+    
+    return fig
+
+
+# Coaching tips per anomaly type, indexed by int(z_score > 0): (below usual, above usual)
+ANOMALY_TIPS = {
+    'position_size': (
+        "This position is unusually small compared to your typical trades. Consider if this aligns with your strategy.",
+        "This position is unusually large. Ensure you have adequate risk management in place."
+    ),
+    'stock_beta': (
+        "This stock is less volatile than your usual picks. Returns may be more modest.",
+        "This stock is significantly more volatile than your usual picks. Be prepared for larger price swings."
+    )
+}
+
 
 # Page configuration
 st.set_page_config(
@@ -56,22 +251,41 @@ st.markdown("Analyze your trades with AI-powered insights and behavioral pattern
 # Sidebar - Trade Input Form
 st.sidebar.header("🔧 Log New Trade")
 
+# Form defaults, keyed by widget; seeded into the session state once per session
+# so reruns don't recompute them (the widgets read them back through their keys)
+FORM_DEFAULTS = {
+    'ticker': "AAPL",
+    'entry_price': 150.00,
+    'horizon': 7,
+    'position_size': 10000.00,
+    'stock_beta': 1.2,
+    'sector': "Technology",
+    'use_mock': False
+}
+
+# Bound the entry date by today on every run so sessions open past midnight can pick it
+today = date.today()
+if 'entry_date' not in st.session_state:
+    for key, value in FORM_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+    st.session_state.entry_date = today - timedelta(days=7)
+
 with st.sidebar.form("trade_form"):
     st.subheader("Trade Details")
     
     # Input fields
-    ticker = st.text_input("Ticker Symbol", value="AAPL", help="Stock ticker symbol (e.g., AAPL, TSLA)")
-    entry_price = st.number_input("Entry Price ($)", min_value=0.01, value=150.00, step=0.01)
+    ticker = st.text_input("Ticker Symbol", key='ticker', help="Stock ticker symbol (e.g., AAPL, TSLA)")
+    entry_price = st.number_input("Entry Price ($)", min_value=0.01, step=0.01, key='entry_price')
     entry_date = st.date_input(
         "Entry Date",
-        value=datetime.now() - timedelta(days=7),
-        max_value=datetime.now()
+        max_value=today,
+        key='entry_date'
     )
     
     horizon = st.selectbox(
         "Horizon (days)",
         options=[7, 30, 90],
-        index=0,
+        key='horizon',
         help="Analysis period from entry date"
     )
     
@@ -81,8 +295,8 @@ with st.sidebar.form("trade_form"):
     position_size = st.number_input(
         "Position Size ($)",
         min_value=0.0,
-        value=10000.00,
         step=100.00,
+        key='position_size',
         help="Total dollar value of the position"
     )
     
@@ -90,14 +304,14 @@ with st.sidebar.form("trade_form"):
         "Stock Beta",
         min_value=0.0,
         max_value=5.0,
-        value=1.2,
         step=0.1,
+        key='stock_beta',
         help="Stock's beta (market sensitivity)"
     )
     
     sector = st.text_input(
         "Sector",
-        value="Technology",
+        key='sector',
         help="Industry sector of the stock"
     )
     
@@ -105,7 +319,7 @@ with st.sidebar.form("trade_form"):
     
     use_mock = st.checkbox(
         "Use Mock Data",
-        value=False,
+        key='use_mock',
         help="Use simulated data instead of Tiger API"
     )
     
@@ -127,30 +341,44 @@ if analyze_button:
                 )
                 st.info("ℹ️ Using mock data for analysis")
             else:
-                # Use Tiger API
-                tiger_client = TigerClientManager()
-                df_historical = tiger_client.get_historical_data(
-                    symbol=ticker,
-                    horizon_days=horizon + 10
-                )
-                st.success(f"✅ Fetched {len(df_historical)} days of market data from Tiger API")
+                # Use Tiger API (repeat requests are served from the cache)
+                try:
+                    df_historical = _fetch_historical_data(ticker, horizon + 10, date.today())
+                except _NoHistoricalData:
+                    # Reported by the empty-data check below
+                    df_historical = pd.DataFrame()
+                else:
+                    st.success(f"✅ Fetched {len(df_historical)} days of market data from Tiger API")
             
             # Validate data
             if df_historical.empty:
                 st.error("❌ No historical data available. Try using mock data instead.")
                 st.stop()
             
+            # Convert the entry date once: a Timestamp for the chart, and a
+            # datetime64 that the timing analysis and the chart slice use as is
+            entry_ts = pd.Timestamp(entry_date)
+            entry_np = entry_ts.to_datetime64()
+            
             # Run trade timing analysis
-            # Convert date to pandas datetime for compatibility
-            entry_datetime = pd.to_datetime(entry_date)
             timing_analysis = analyze_trade_timing(
                 entry_price=entry_price,
-                entry_date=entry_datetime,
+                entry_date=entry_np,
                 df_historical=df_historical
             )
             
-            # Get trade history for behavioral analysis
-            trade_history = get_trades_for_behavioral_analysis()
+            # Unpack the timing metrics once for the render code below
+            timing_score = timing_analysis.entry_timing_score
+            ideal_entry = timing_analysis.ideal_entry
+            ideal_entry_date = pd.Timestamp(timing_analysis.ideal_entry_date)
+            mfe_price = timing_analysis.mfe
+            mfe_percent = timing_analysis.mfe_percent
+            mae_price = timing_analysis.mae
+            mae_percent = timing_analysis.mae_percent
+            missed_profit = timing_analysis.missed_profit_potential
+            
+            # Get trade history statistics for behavioral analysis
+            trade_history = _get_behavioral_history()
             
             # Run behavioral analysis
             current_trade = {
@@ -170,9 +398,11 @@ if analyze_button:
                 stock_beta=stock_beta,
                 sector=sector
             )
+            _get_recent_trades.clear()
+            _get_behavioral_history.clear()
             
             # Save analysis results
-            save_analysis_result(trade_id, 'timing', timing_analysis)
+            save_analysis_result(trade_id, 'timing', timing_analysis.as_dict())
             save_analysis_result(trade_id, 'behavioral', behavioral_analysis)
             
             st.success(f"✅ Trade #{trade_id} saved to database")
@@ -186,7 +416,6 @@ if analyze_button:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                timing_score = timing_analysis['entry_timing_score']
                 delta_color = "normal" if timing_score >= -5 else "off"
                 st.metric(
                     "Timing Score",
@@ -199,14 +428,13 @@ if analyze_button:
             with col2:
                 st.metric(
                     "Ideal Entry",
-                    f"${timing_analysis['ideal_entry']:.2f}",
-                    delta=f"${timing_analysis['ideal_entry'] - entry_price:.2f}",
+                    f"${ideal_entry:.2f}",
+                    delta=f"${ideal_entry - entry_price:.2f}",
                     delta_color="inverse",
                     help="The best possible entry price during the period"
                 )
             
             with col3:
-                mfe_percent = timing_analysis['mfe_percent']
                 st.metric(
                     "MFE %",
                     f"{mfe_percent:.2f}%",
@@ -216,7 +444,6 @@ if analyze_button:
                 )
             
             with col4:
-                mae_percent = timing_analysis['mae_percent']
                 st.metric(
                     "MAE %",
                     f"{mae_percent:.2f}%",
@@ -229,82 +456,21 @@ if analyze_button:
             st.markdown("---")
             st.subheader("📈 Price Action Chart")
             
-            # Filter data from entry date
-            df_chart = df_historical[df_historical['date'] >= pd.to_datetime(entry_date)].copy()
-            
-            # Create candlestick chart
-            fig = go.Figure()
-            
-            # Add candlestick
-            fig.add_trace(go.Candlestick(
-                x=df_chart['date'],
-                open=df_chart['open'],
-                high=df_chart['high'],
-                low=df_chart['low'],
-                close=df_chart['close'],
-                name='Price',
-                increasing_line_color='#26a69a',
-                decreasing_line_color='#ef5350'
-            ))
-            
-            # Add entry point marker
-            entry_datetime = pd.to_datetime(entry_date)
-            fig.add_trace(go.Scatter(
-                x=[entry_datetime],
-                y=[entry_price],
-                mode='markers',
-                marker=dict(
-                    symbol='diamond',
-                    size=20,
-                    color='gold',
-                    line=dict(color='darkgoldenrod', width=2)
-                ),
-                name=f'Entry: ${entry_price:.2f}',
-                hovertemplate=f'<b>Your Entry</b><br>Price: ${entry_price:.2f}<br>Date: {entry_date}<extra></extra>'
-            ))
-            
-            # Add ideal entry marker (MAE)
-            ideal_entry_price = timing_analysis['ideal_entry']
-            mae_date = df_chart[df_chart['low'] == df_chart['low'].min()]['date'].iloc[0]
-            fig.add_trace(go.Scatter(
-                x=[mae_date],
-                y=[ideal_entry_price],
-                mode='markers',
-                marker=dict(
-                    symbol='star',
-                    size=18,
-                    color='lime',
-                    line=dict(color='darkgreen', width=2)
-                ),
-                name=f'Ideal Entry: ${ideal_entry_price:.2f}',
-                hovertemplate=f'<b>Ideal Entry</b><br>Price: ${ideal_entry_price:.2f}<br>Date: {mae_date.strftime("%Y-%m-%d")}<extra></extra>'
-            ))
+            # Slice data from entry date; the bars normally arrive sorted, so a
+            # binary search gives the start row and the chart reads a view
+            if df_historical['date'].is_monotonic_increasing:
+                df_chart = df_historical.iloc[df_historical['date'].searchsorted(entry_np):]
+            else:
+                df_chart = df_historical[df_historical['date'] >= entry_np]
             
-            # Add MFE line
-            mfe_price = timing_analysis['mfe']
-            fig.add_hline(
-                y=mfe_price,
-                line_dash="dash",
-                line_color="green",
-                annotation_text=f"MFE: ${mfe_price:.2f}",
-                annotation_position="right"
-            )
+            # The chart only needs display precision; float32 prices halve what is
+            # hashed for the chart cache and serialized to the browser. The timing
+            # analysis above keeps working on the full-precision frame.
+            df_chart = df_chart.astype({column: 'float32' for column in ('open', 'high', 'low', 'close')})
             
-            # Update layout
-            fig.update_layout(
-                title=f"{ticker} - {horizon} Day Analysis Period",
-                yaxis_title="Price ($)",
-                xaxis_title="Date",
-                height=600,
-                hovermode='x unified',
-                showlegend=True,
-                legend=dict(
-                    yanchor="top",
-                    y=0.99,
-                    xanchor="left",
-                    x=0.01
-                ),
-                xaxis_rangeslider_visible=False
+            # Create candlestick chart (rebuilt only when its inputs change)
+            fig = _build_price_chart(
+                df_chart, ticker, horizon, entry_ts, entry_price, ideal_entry, ideal_entry_date, mfe_price
             )
             
             st.plotly_chart(fig, use_container_width=True)
@@ -326,13 +492,16 @@ if analyze_button:
                 else:
                     st.error(f"❌ **POOR** - Entry was significantly above ideal price")
                 
-                st.write("**Details:**")
-                st.write(f"- Actual Entry: **${entry_price:.2f}**")
-                st.write(f"- Ideal Entry: **${timing_analysis['ideal_entry']:.2f}**")
-                st.write(f"- Difference: **${entry_price - timing_analysis['ideal_entry']:.2f}**")
-                st.write(f"- Maximum Favorable Excursion: **${mfe_price:.2f}** (+{mfe_percent:.2f}%)")
-                st.write(f"- Maximum Adverse Excursion: **${timing_analysis['mae']:.2f}** ({mae_percent:.2f}%)")
-                st.write(f"- Missed Profit Potential: **{timing_analysis['missed_profit_potential']:.2f}%**")
+                # One markdown block instead of a Streamlit element per line
+                st.markdown(
+                    "**Details:**\n\n"
+                    f"- Actual Entry: **${entry_price:.2f}**\n"
+                    f"- Ideal Entry: **${ideal_entry:.2f}**\n"
+                    f"- Difference: **${entry_price - ideal_entry:.2f}**\n"
+                    f"- Maximum Favorable Excursion: **${mfe_price:.2f}** (+{mfe_percent:.2f}%)\n"
+                    f"- Maximum Adverse Excursion: **${mae_price:.2f}** ({mae_percent:.2f}%)\n"
+                    f"- Missed Profit Potential: **{missed_profit:.2f}%**"
+                )
             
             with col_right:
                 st.subheader("🧠 Behavioral Analysis")
@@ -341,32 +510,34 @@ if analyze_button:
                 if behavioral_analysis['is_anomaly']:
                     st.warning(f"⚠️ **ANOMALIES DETECTED** - {len(behavioral_analysis['anomalies'])} issue(s) found")
                     
+                    # Emit the whole list as one element: a collapsible <details>
+                    # block per anomaly instead of an expander and several
+                    # elements for each
+                    parts = []
                     for i, anomaly in enumerate(behavioral_analysis['anomalies'], 1):
-                        with st.expander(f"🔴 Anomaly {i}: {anomaly['type'].replace('_', ' ').title()}"):
-                            st.write(f"**{anomaly['message']}**")
-                            st.write(f"- Current Value: **{anomaly['current_value']:,.2f}**")
-                            st.write(f"- Historical Mean: **{anomaly['historical_mean']:,.2f}**")
-                            st.write(f"- Z-Score: **{anomaly['z_score']:.2f}σ**")
-                            
-                            if anomaly['type'] == 'position_size':
-                                if anomaly['z_score'] > 0:
-                                    st.info("💡 **Tip**: This position is unusually large. Ensure you have adequate risk management in place.")
-                                else:
-                                    st.info("💡 **Tip**: This position is unusually small compared to your typical trades. Consider if this aligns with your strategy.")
-                            elif anomaly['type'] == 'stock_beta':
-                                if anomaly['z_score'] > 0:
-                                    st.info("💡 **Tip**: This stock is significantly more volatile than your usual picks. Be prepared for larger price swings.")
-                                else:
-                                    st.info("💡 **Tip**: This stock is less volatile than your usual picks. Returns may be more modest.")
+                        tips = ANOMALY_TIPS.get(anomaly['type'])
+                        tip = f"<p>💡 <b>Tip</b>: {tips[int(anomaly['z_score'] > 0)]}</p>" if tips else ""
+                        parts.append(
+                            f"<details><summary>🔴 Anomaly {i}: {anomaly['type'].replace('_', ' ').title()}</summary>"
+                            f"<p><b>{html.escape(anomaly['message'])}</b></p>"
+                            "<ul>"
+                            f"<li>Current Value: <b>{anomaly['current_value']:,.2f}</b></li>"
+                            f"<li>Historical Mean: <b>{anomaly['historical_mean']:,.2f}</b></li>"
+                            f"<li>Z-Score: <b>{anomaly['z_score']:.2f}σ</b></li>"
+                            "</ul>"
+                            f"{tip}</details>"
+                        )
+                    st.markdown("\n".join(parts), unsafe_allow_html=True)
                 else:
                     st.success("✅ **WITHIN NORMAL PARAMETERS**")
-                    st.write("This trade aligns with your typical trading behavior:")
                     
-                    if behavioral_analysis['metrics']:
-                        if 'position_size_mean' in behavioral_analysis['metrics']:
-                            st.write(f"- Position Size: ${position_size:,.2f} (avg: ${behavioral_analysis['metrics']['position_size_mean']:,.2f})")
-                        if 'stock_beta_mean' in behavioral_analysis['metrics']:
-                            st.write(f"- Stock Beta: {stock_beta:.2f} (avg: {behavioral_analysis['metrics']['stock_beta_mean']:.2f})")
+                    metrics = behavioral_analysis['metrics']
+                    lines = ["This trade aligns with your typical trading behavior:", ""]
+                    if 'position_size_mean' in metrics:
+                        lines.append(f"- Position Size: ${position_size:,.2f} (avg: ${metrics['position_size_mean']:,.2f})")
+                    if 'stock_beta_mean' in metrics:
+                        lines.append(f"- Stock Beta: {stock_beta:.2f} (avg: {metrics['stock_beta_mean']:.2f})")
+                    st.markdown("\n".join(lines))
                 
                 # Warnings
                 if behavioral_analysis['warnings']:
@@ -382,48 +553,71 @@ if analyze_button:
         
         except Exception as e:
             st.error(f"❌ Error analyzing trade: {str(e)}")
-            st.exception(e)
+            # Keep the traceback server-side unless debugging, same flag as the CLI
+            log.exception("Trade analysis failed for %s", ticker)
+            if os.getenv('TRADING_COACH_DEBUG'):
+                st.exception(e)
+            else:
+                st.caption("Details logged server-side.")
 
 # History View
-st.markdown("---")
-st.subheader("📜 Recent Trade History")
+# Trade fields shown in the history table, in display order, with their labels
+HISTORY_COLUMNS = {
+    'id': 'ID',
+    'symbol': 'Symbol',
+    'entry_price': 'Entry Price',
+    'entry_date': 'Entry Date',
+    'horizon': 'Horizon',
+    'position_size': 'Position Size',
+    'stock_beta': 'Beta',
+    'sector': 'Sector'
+}
 
-try:
-    recent_trades = get_last_n_trades(n=5)
+
+@st.fragment
+def _render_trade_history():
+    """
+    Render the recent trade table.
     
-    if recent_trades:
-        # Convert to DataFrame for display
-        history_df = pd.DataFrame(recent_trades)
-        
-        # Format columns
-        history_df['entry_date'] = pd.to_datetime(history_df['entry_date']).dt.strftime('%Y-%m-%d')
-        history_df['entry_price'] = history_df['entry_price'].apply(lambda x: f"${x:.2f}")
-        history_df['position_size'] = history_df['position_size'].apply(lambda x: f"${x:,.0f}" if pd.notna(x) else "N/A")
-        history_df['stock_beta'] = history_df['stock_beta'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "N/A")
-        
-        # Rename columns
-        history_df = history_df.rename(columns={
-            'id': 'ID',
-            'symbol': 'Symbol',
-            'entry_price': 'Entry Price',
-            'entry_date': 'Entry Date',
-            'horizon': 'Horizon',
-            'position_size': 'Position Size',
-            'stock_beta': 'Beta',
-            'sector': 'Sector'
-        })
-        
-        # Display table
-        st.dataframe(
-            history_df[['ID', 'Symbol', 'Entry Price', 'Entry Date', 'Horizon', 'Position Size', 'Beta', 'Sector']],
-            use_container_width=True,
-            hide_index=True
-        )
-    else:
-        st.info("No trade history yet. Analyze your first trade to get started!")
+    As a fragment, its refresh button reruns only this panel, so the analysis
+    results above stay on screen while the table picks up new trades (e.g.
+    ones logged from the CLI).
+    """
+    if st.button("🔄 Refresh", key="refresh_history"):
+        _get_recent_trades.clear()
+    
+    try:
+        recent_trades = _get_recent_trades(5)
         
-except Exception as e:
-    st.error(f"Error loading trade history: {str(e)}")
+        if recent_trades:
+            # Convert to DataFrame for display, keeping only the shown columns in display order
+            history_df = pd.DataFrame.from_records(recent_trades, columns=list(HISTORY_COLUMNS))
+            
+            # Format columns
+            history_df['entry_date'] = pd.to_datetime(history_df['entry_date']).dt.strftime('%Y-%m-%d')
+            history_df['entry_price'] = history_df['entry_price'].map('${:.2f}'.format)
+            history_df['position_size'] = history_df['position_size'].map('${:,.0f}'.format, na_action='ignore').fillna("N/A")
+            history_df['stock_beta'] = history_df['stock_beta'].map('{:.2f}'.format, na_action='ignore').fillna("N/A")
+            
+            # Relabel columns in place
+            history_df.columns = list(HISTORY_COLUMNS.values())
+            
+            # Display table
+            st.dataframe(
+                history_df,
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("No trade history yet. Analyze your first trade to get started!")
+            
+    except Exception as e:
+        st.error(f"Error loading trade history: {str(e)}")
+
+
+st.markdown("---")
+st.subheader("📜 Recent Trade History")
+_render_trade_history()
 
 # Footer
 st.markdown("---")